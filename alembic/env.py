@@ -6,7 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 # alembic/env.py
 from app.base import Base
-from app.models import user_model, invitation_model  # ensure these are loaded so metadata works
+from app.models import user_model, invitation_model, refresh_token_model, outbox_model  # ensure these are loaded so metadata works
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,26 @@
+"""Add (created_at, id) index on users for keyset pagination
+
+Revision ID: 11bb06275c93
+Revises: 6e4504c0ed67
+Create Date: 2026-10-18 09:12:40.117342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '11bb06275c93'
+down_revision: Union[str, None] = '6e4504c0ed67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,41 @@
+"""Add user search indexes
+
+Revision ID: 7a3f0c9d2e41
+Revises: 11bb06275c93
+Create Date: 2026-10-18 10:02:13.508211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3f0c9d2e41'
+down_revision: Union[str, None] = '11bb06275c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Build concurrently so large users tables stay writable during the migration.
+    # created_at range filters are served by ix_users_created_at_id.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_nickname_trgm', 'users', ['nickname'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'nickname': 'gin_trgm_ops'},
+                        postgresql_concurrently=True)
+        op.create_index('ix_users_email_trgm', 'users', ['email'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'},
+                        postgresql_concurrently=True)
+        op.create_index('ix_users_role', 'users', ['role'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_users_is_locked', 'users', ['is_locked'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_is_locked', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_role', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_email_trgm', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_nickname_trgm', table_name='users', postgresql_concurrently=True)
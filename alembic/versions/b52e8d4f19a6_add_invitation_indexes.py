@@ -0,0 +1,44 @@
+"""Add pending-invite unique index and inviter index to invitations
+
+Revision ID: b52e8d4f19a6
+Revises: 7a3f0c9d2e41
+Create Date: 2026-10-18 10:47:55.630918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b52e8d4f19a6'
+down_revision: Union[str, None] = '7a3f0c9d2e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Older code could race past the duplicate check; keep only the newest pending
+    # invite per email so the unique index can be built.
+    op.execute("""
+        UPDATE invitations SET status = 'superseded'
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY invitee_email ORDER BY created_at DESC NULLS LAST, id
+                ) AS rn
+                FROM invitations
+                WHERE status = 'pending'
+            ) ranked
+            WHERE ranked.rn > 1
+        )
+    """)
+    op.create_index('uq_invitations_pending_invitee_email', 'invitations', ['invitee_email'], unique=True,
+                    postgresql_where=sa.text("status = 'pending'"))
+    op.create_index('ix_invitations_inviter_id_status', 'invitations', ['inviter_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invitations_inviter_id_status', table_name='invitations')
+    op.drop_index('uq_invitations_pending_invitee_email', table_name='invitations')
@@ -0,0 +1,26 @@
+"""Add token_version to users
+
+Revision ID: d4e1a7c93b20
+Revises: b52e8d4f19a6
+Create Date: 2026-10-18 13:12:08.215406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e1a7c93b20'
+down_revision: Union[str, None] = 'b52e8d4f19a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -1,23 +1,167 @@
 # app/database.py
 
+import itertools
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.base import Base  # ✅ your Base is imported from a separate file
-import asyncio
+from settings.config import Settings, settings as default_settings
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long callers wait to check out a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.reset_wait_stats()
+
+    def reset_wait_stats(self):
+        with self._stats_lock:
+            self._checkouts = 0
+            self._timeouts = 0
+            self._wait_total = 0.0
+            self._wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._timeouts += int(timed_out)
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def stats(self) -> dict:
+        """Live pool occupancy plus cumulative checkout wait times (seconds)."""
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "wait_time_total": self._wait_total,
+                "wait_time_avg": self._wait_total / checkouts if checkouts else 0.0,
+                "wait_time_max": self._wait_max,
+            }
+
+
+def build_engine_options(database_url: str, settings: Settings) -> dict:
+    """Translate pool settings into `create_async_engine` keyword arguments."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        # SQLite picks its own pool class; sizing options do not apply.
+        return {}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+    if url.get_driver_name() == "asyncpg":
+        if settings.db_pgbouncer_mode:
+            # pgbouncer in transaction mode cannot keep named prepared statements
+            # alive across transactions, so disable both caches and use unique names.
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        else:
+            options["connect_args"] = {
+                "statement_cache_size": settings.db_statement_cache_size,
+                "prepared_statement_cache_size": settings.db_statement_cache_size,
+            }
+    return options
+
+
+class RecentWriteTracker:
+    """Remembers which clients wrote recently so their reads can stay on the primary."""
+
+    _PRUNE_THRESHOLD = 10000
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._deadlines: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, client_key: str):
+        now = time.monotonic()
+        with self._lock:
+            self._deadlines[client_key] = now + self.window_seconds
+            if len(self._deadlines) > self._PRUNE_THRESHOLD:
+                self._deadlines = {key: deadline for key, deadline in self._deadlines.items() if deadline > now}
+
+    def wrote_recently(self, client_key: str) -> bool:
+        with self._lock:
+            deadline = self._deadlines.get(client_key)
+            if deadline is None:
+                return False
+            if deadline <= time.monotonic():
+                del self._deadlines[client_key]
+                return False
+            return True
+
 
 class Database:
     """Handles database connections and sessions."""
     _engine = None
     _session_factory = None
+    _read_engines: List = []
+    _read_session_factories: List = []
+    _read_cycle = None
+    _write_tracker = RecentWriteTracker(default_settings.read_your_writes_seconds)
 
     @classmethod
-    def initialize(cls, database_url: str, echo: bool = False):
-        """Initialize the async engine and sessionmaker."""
+    def initialize(
+        cls,
+        database_url: str,
+        echo: bool = False,
+        settings: Optional[Settings] = None,
+        read_urls: Optional[List[str]] = None,
+    ):
+        """Initialize the async engine and sessionmaker, plus optional read replica engines."""
         if cls._engine is None:
-            cls._engine = create_async_engine(database_url, echo=echo, future=True)
-            cls._session_factory = sessionmaker(
-                bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
-            )
+            settings = settings or default_settings
+            options = build_engine_options(database_url, settings)
+            cls._engine = create_async_engine(database_url, echo=echo, future=True, **options)
+            cls._session_factory = cls._make_session_factory(cls._engine)
+
+            if read_urls is None:
+                read_urls = settings.database_read_urls
+            cls._read_engines = [
+                create_async_engine(url, echo=echo, future=True, **build_engine_options(url, settings))
+                for url in read_urls
+            ]
+            cls._read_session_factories = [cls._make_session_factory(engine) for engine in cls._read_engines]
+            cls._read_cycle = itertools.cycle(cls._read_session_factories) if cls._read_session_factories else None
+            cls._write_tracker = RecentWriteTracker(settings.read_your_writes_seconds)
+
+    @staticmethod
+    def _make_session_factory(engine):
+        return sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, future=True)
 
     @classmethod
     def get_session_factory(cls):
@@ -26,12 +170,70 @@ class Database:
             raise ValueError("Database not initialized. Call `initialize()` first.")
         return cls._session_factory
 
+    @classmethod
+    def get_read_session_factory(cls, client_key: Optional[str] = None):
+        """
+        Returns a session factory for read-only work.
+
+        Replicas are used round-robin. The primary is returned when no replicas are
+        configured, or when `client_key` wrote within the read-your-writes window.
+        """
+        primary = cls.get_session_factory()
+        if cls._read_cycle is None:
+            return primary
+        if client_key is not None and cls._write_tracker.wrote_recently(client_key):
+            return primary
+        return next(cls._read_cycle)
+
+    @classmethod
+    def mark_write(cls, client_key: str):
+        """Pin `client_key`'s reads to the primary for the read-your-writes window."""
+        cls._write_tracker.mark(client_key)
+
     @classmethod
     def get_engine(cls):
         if cls._engine is None:
             raise ValueError("Database not initialized. Call `initialize()` first.")
         return cls._engine
 
+    @classmethod
+    def get_read_engines(cls) -> list:
+        return list(cls._read_engines)
+
+    @classmethod
+    def get_pool_stats(cls) -> dict:
+        """Return live connection pool statistics for the primary engine."""
+        return cls._engine_pool_stats(cls.get_engine())
+
+    @classmethod
+    def get_read_pool_stats(cls) -> List[dict]:
+        """Return live connection pool statistics for each read replica engine."""
+        return [cls._engine_pool_stats(engine) for engine in cls._read_engines]
+
+    @staticmethod
+    def _engine_pool_stats(engine) -> dict:
+        pool = engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            return pool.stats()
+        return {"status": pool.status()}
+
+    @classmethod
+    async def close(cls):
+        """Close all pooled connections; the engines stay usable and reconnect on demand."""
+        for engine in [cls._engine, *cls._read_engines]:
+            if engine is not None:
+                await engine.dispose()
+
+    @classmethod
+    async def dispose(cls):
+        """Close all pooled connections and forget the engines."""
+        await cls.close()
+        cls._engine = None
+        cls._session_factory = None
+        cls._read_engines = []
+        cls._read_session_factories = []
+        cls._read_cycle = None
+
 
 # ✅ Optional: Add this function only if you really need to manually create tables
 async def init_db():
@@ -1,17 +1,21 @@
+import logging
 from uuid import UUID
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.database import Database
 from app.services.jwt_service import decode_token
+from app.services.principal_cache import principal_cache, token_version_cache
 from app.models.user_model import User, UserRole
-from app.utils.template_manager import TemplateManager
+from app.utils.security import HashingPoolFull
+from app.utils.template_manager import get_template_manager
 from app.services.email_service import EmailService
-from settings.config import Settings
+from settings.config import Settings, settings as app_settings
 
 security = HTTPBearer()
+logger = logging.getLogger(__name__)
 
 # Get application settings
 def get_settings() -> Settings:
@@ -19,15 +23,65 @@ def get_settings() -> Settings:
 
 # Get email service instance
 def get_email_service() -> EmailService:
-    template_manager = TemplateManager()
-    return EmailService(template_manager=template_manager)
+    return EmailService(template_manager=get_template_manager())
 
-# Get database session
+# Get database session (one unit of work per request)
 async def get_db() -> AsyncSession:
+    """
+    Yield a primary session for the request.
+
+    The session is lazy: it checks out a pool connection only when the first
+    statement runs. Services commit writes themselves; anything left
+    uncommitted (e.g. the implicit transaction of plain reads) is rolled back
+    when the session closes.
+    """
     async_session_factory = Database.get_session_factory()
     async with async_session_factory() as session:
         try:
             yield session
+        except HTTPException:
+            await session.rollback()
+            raise
+        except HashingPoolFull as e:
+            await session.rollback()
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        except Exception as e:
+            await session.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+
+# Identify the caller for read-your-writes routing: the authenticated user, else the client address
+def get_client_key(request: Request) -> str:
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = decode_token(token)
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"addr:{get_client_address(request)}"
+
+def get_client_address(request: Request) -> str:
+    """
+    The caller's address: the last X-Forwarded-For hop not added by a trusted proxy
+    when the request came through one (`trusted_proxies`), else the peer address.
+    """
+    host = request.client.host if request.client else "anonymous"
+    trusted = app_settings.trusted_proxies
+    if host not in trusted:
+        return host
+    forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(forwarded):
+        if hop not in trusted:
+            return hop
+    return host
+
+# Get a read-only database session (replica, or primary if the client wrote recently)
+async def get_read_db(request: Request) -> AsyncSession:
+    async_session_factory = Database.get_read_session_factory(get_client_key(request))
+    async with async_session_factory() as session:
+        try:
+            yield session
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -57,22 +111,70 @@ async def get_current_user(
     except ValueError:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == user_uuid))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise credentials_exception
+    user = principal_cache.get(user_uuid)
+    if user is None:
+        result = await db.execute(select(User).where(User.id == user_uuid))
+        user = result.scalar_one_or_none()
+        if not user:
+            raise credentials_exception
+        principal_cache.put(user)
 
     # ✅ Ensure role is a proper enum (fix for require_role)
     if isinstance(user.role, str):
         user.role = UserRole(user.role)
 
-    print(f"👤 get_current_user found: {user} for token payload: {payload}")
+    logger.debug("get_current_user resolved user %s", user.id)
     return user
 
 
+# Authorize from signed claims only (auth_mode="claims")
+async def get_token_principal(credentials: HTTPAuthorizationCredentials, db: AsyncSession) -> User:
+    """
+    Build the caller from the token's `sub`, `role` and `ver` claims.
+
+    The token is honoured only while `ver` matches the user's current `token_version`
+    and the account is unlocked. Both come from `token_version_cache`, so a warm
+    request does not touch the users table. Returns a transient `User` carrying just
+    `id`, `role` and `token_version`.
+    """
+    credentials_exception = HTTPException(
+        status_code=401,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = decode_token(credentials.credentials)
+    if not payload:
+        raise credentials_exception
+    try:
+        user_uuid = UUID(payload["sub"])
+        role = UserRole[payload["role"]]
+    except (KeyError, ValueError):
+        raise credentials_exception
+
+    cached = token_version_cache.get(user_uuid)
+    if cached is None:
+        result = await db.execute(select(User.token_version, User.is_locked).where(User.id == user_uuid))
+        row = result.one_or_none()
+        if row is None:
+            raise credentials_exception
+        token_version_cache.put(user_uuid, (row.token_version, bool(row.is_locked)))
+        cached = (row.token_version, row.is_locked)
+
+    token_version, is_locked = cached
+    if is_locked or payload.get("ver", 0) != token_version:
+        raise credentials_exception
+    return User(id=user_uuid, role=role, token_version=token_version)
+
 # Role-based access control
 def require_role(roles: list[str]):
-    async def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        db: AsyncSession = Depends(get_db)
+    ):
+        if app_settings.auth_mode == "claims":
+            current_user = await get_token_principal(credentials, db)
+        else:
+            current_user = await get_current_user(credentials, db)
         if current_user.role.name not in roles:
             raise HTTPException(status_code=403, detail="Operation not permitted")
         return current_user
@@ -4,22 +4,25 @@ from fastapi.openapi.utils import get_openapi
 from starlette.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-import os
-import smtplib
-from email.mime.text import MIMEText
+import asyncio
+import logging
+import signal
 
 # Internal imports
 from app.database import Database
-from app.dependencies import get_settings
+from app.dependencies import get_client_key, get_settings
+from app.services.health_service import HealthMonitor
+from app.services.jwt_service import get_keyring, reload_keyring, uses_asymmetric_keys
+from app.services.outbox_service import OutboxRelay
+from app.services.refresh_token_service import purge_expired_tokens_forever
+from app.utils.admission import AdmissionController, AdmissionMiddleware
 from app.utils.api_description import getDescription
-from app.routers import user_routes, invite_routes # 👈 Include auth routes separately
+from app.utils.smtp_connection import close_smtp_client
+from app.routers import user_routes, invite_routes, jwks_routes, health_routes # 👈 Include auth routes separately
 
 # 🌐 Load environment variables
 load_dotenv()
-SMTP_SERVER = os.getenv("smtp_server")
-SMTP_PORT = int(os.getenv("smtp_port", 2525))
-SMTP_USERNAME = os.getenv("smtp_username")
-SMTP_PASSWORD = os.getenv("smtp_password")
+logger = logging.getLogger(__name__)
 
 # 🚀 FastAPI instance
 app = FastAPI(
@@ -57,6 +60,10 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+# 🚦 Admission control: shed floods on expensive routes (login, register, ...) with 503 + Retry-After
+admission_controller = AdmissionController.from_settings(get_settings())
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
 # 🌍 Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -66,35 +73,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def send_test_email():
+# 🔁 Read-your-writes: keep a client's reads on the primary right after it writes
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+@app.middleware("http")
+async def track_client_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        Database.mark_write(get_client_key(request))
+    return response
+
+def reload_keys_on_signal():
     try:
-        msg = MIMEText("This is a test email sent from FastAPI using Mailtrap.")
-        msg["Subject"] = "Mailtrap Test Email"
-        msg["From"] = SMTP_USERNAME
-        msg["To"] = "test@example.com"
-
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=10) as server:
-            server.ehlo()  # Say hello
-            try:
-                server.starttls()  # Attempt to upgrade the connection to TLS
-                server.ehlo()
-            except smtplib.SMTPException:
-                pass  # Ignore if TLS isn't supported (shouldn't happen with Mailtrap)
-
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.sendmail(msg["From"], [msg["To"]], msg.as_string())
-
-        print("✅ Test email sent successfully.")
+        keyring = reload_keyring()
+        logger.info(f"🔑 Reloaded JWT keys; signing with {keyring.active_kid}")
     except Exception as e:
-        print(f"❌ Failed to send test email: {e}")
+        logger.error(f"❌ JWT key reload failed, keeping current keys: {e}")
+
+def install_key_reload_signal():
+    """SIGHUP reloads the JWT key ring in this worker (re-reading JWT_ACTIVE_KID)."""
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_keys_on_signal)
+    except (AttributeError, NotImplementedError, RuntimeError):
+        logger.warning("SIGHUP key reload is not available on this platform")
 
 # ⚙️ App startup
 @app.on_event("startup")
 async def startup_event():
     settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
-    print(f"📡 Mailtrap configured: {SMTP_SERVER}:{SMTP_PORT} as {SMTP_USERNAME}")
-    send_test_email()
+    Database.initialize(settings.database_url, settings.debug, settings)
+    if uses_asymmetric_keys():
+        get_keyring()  # fail fast on missing keys; verification then uses the in-memory key set
+        install_key_reload_signal()
+    app.state.outbox_relay = None
+    if settings.outbox_relay_enabled:
+        app.state.outbox_relay = OutboxRelay.from_settings(settings)
+        app.state.outbox_relay.start()  # 📬 deliver queued emails in the background
+    app.state.refresh_token_purge = None
+    if settings.refresh_token_purge_interval_seconds > 0:
+        stop = asyncio.Event()  # 🧹 delete expired refresh tokens periodically
+        task = asyncio.create_task(purge_expired_tokens_forever(
+            Database.get_session_factory(), settings.refresh_token_purge_interval_seconds, stop,
+        ))
+        app.state.refresh_token_purge = (stop, task)
+    # 🩺 SMTP, MinIO and Postgres are checked in the background; /health/ready reports the results
+    app.state.health_monitor = HealthMonitor.from_settings(settings)
+    app.state.health_monitor.start()
+    logger.info(f"📡 SMTP configured: {settings.smtp_server}:{settings.smtp_port} as {settings.smtp_username}")
+
+# 🛑 App shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    if getattr(app.state, "health_monitor", None) is not None:
+        await app.state.health_monitor.stop()
+    if getattr(app.state, "refresh_token_purge", None) is not None:
+        stop, task = app.state.refresh_token_purge
+        stop.set()
+        await task
+    if getattr(app.state, "outbox_relay", None) is not None:
+        await app.state.outbox_relay.stop()
+    await Database.close()
+    # Closing waits for queued sends (each up to smtp_timeout_seconds), so keep it off the event loop
+    await asyncio.to_thread(close_smtp_client)
 
 # ❗ Global exception handler
 @app.exception_handler(Exception)
@@ -105,3 +145,5 @@ async def exception_handler(request: Request, exc: Exception):
 #app.include_router(auth_routes.router, tags=["Login and Registration"])
 app.include_router(user_routes.router, tags=["User Management (Admin or Manager Roles)"])
 app.include_router(invite_routes.router, tags=["Invites"])
+app.include_router(jwks_routes.router, tags=["Keys"])
+app.include_router(health_routes.router, tags=["Health"])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
@@ -9,6 +9,15 @@ from sqlalchemy import Boolean
 
 class Invitation(Base):
     __tablename__ = "invitations"
+    __table_args__ = (
+        # At most one pending invite per email; create_invite relies on this instead of a pre-check
+        Index(
+            "uq_invitations_pending_invitee_email", "invitee_email", unique=True,
+            postgresql_where=text("status = 'pending'"), sqlite_where=text("status = 'pending'"),
+        ),
+        # GET /me/invites counts by inviter and status
+        Index("ix_invitations_inviter_id_status", "inviter_id", "status"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     inviter_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
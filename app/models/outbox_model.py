@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped
+
+from app.base import Base
+
+
+class OutboxMessage(Base):
+    """
+    A side effect (e.g. an email) recorded in the same transaction as the change that caused it.
+
+    The outbox relay claims `pending` messages whose `available_at` has passed
+    (status `sending`, with `available_at` pushed out as a lease), delivers them,
+    then marks them `sent` (keeping only a redacted payload) or reschedules them with
+    backoff. `attempts` counts claims, so once `max_attempts` deliveries have failed or
+    never finished the message is parked as `dead` for inspection.
+    """
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        # The relay polls for due pending messages in available_at order
+        Index("ix_outbox_messages_status_available_at", "status", "available_at"),
+    )
+
+    id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = Column(String(50), nullable=False)
+    payload: Mapped[dict] = Column(JSON, nullable=False)
+    status: Mapped[str] = Column(String(20), nullable=False, default="pending")
+    attempts: Mapped[int] = Column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error: Mapped[str] = Column(Text, nullable=True)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped
+
+from app.base import Base
+
+
+class RefreshToken(Base):
+    """
+    A rotating refresh token, stored only as the SHA-256 hex digest of the token.
+
+    Tokens issued from one login share a `family_id`. Each refresh marks the
+    presented token used and issues the next one in the family; presenting a used
+    token again revokes the whole family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=False, index=True)
+    token_hash: Mapped[str] = Column(String(64), nullable=False, unique=True)
+    # users.token_version when issued; a role or password change invalidates the family
+    token_version: Mapped[int] = Column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False)
+    used_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
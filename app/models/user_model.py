@@ -4,7 +4,7 @@ from enum import Enum
 from app.base import Base
 import uuid
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum
+    Column, String, Integer, DateTime, Boolean, Index, func, text, Enum as SQLAlchemyEnum
 )
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import Mapped, mapped_column
@@ -13,6 +13,12 @@ from sqlalchemy.orm import relationship
 from app.base import Base
 # keep the rest of your imports
 
+def _has_pg_trgm(ddl, target, bind, **kw) -> bool:
+    """Create the trigram indexes only where pg_trgm is installed (the Alembic migration installs it)."""
+    if bind is None:
+        return True
+    return bind.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+
 class UserRole(Enum):
     """Enumeration of user roles within the application, stored as ENUM in the database."""
     ANONYMOUS = "ANONYMOUS"
@@ -44,6 +50,7 @@ class User(Base):
         last_login_at (datetime): Timestamp of the last login.
         failed_login_attempts (int): Count of failed login attempts.
         is_locked (bool): Flag indicating if the account is locked.
+        token_version (int): Bumped to revoke access tokens issued before a role or password change.
         created_at (datetime): Timestamp when the user was created, set by the server.
         updated_at (datetime): Timestamp of the last update, set by the server.
 
@@ -56,6 +63,19 @@ class User(Base):
     """
     __tablename__ = "users"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Keyset pagination order for GET /users/ and created_at range filters
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Fragment search (ILIKE '%q%') for GET /users/search; skipped by create_all without pg_trgm
+        Index(
+            "ix_users_nickname_trgm", "nickname", postgresql_using="gin", postgresql_ops={"nickname": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql", callable_=_has_pg_trgm),
+        Index(
+            "ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql", callable_=_has_pg_trgm),
+        Index("ix_users_role", "role"),
+        Index("ix_users_is_locked", "is_locked"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nickname: Mapped[str] = Column(String(50), unique=True, nullable=False, index=True)
@@ -72,11 +92,14 @@ class User(Base):
     last_login_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
     failed_login_attempts: Mapped[int] = Column(Integer, default=0)
     is_locked: Mapped[bool] = Column(Boolean, default=False)
+    token_version: Mapped[int] = Column(Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    verification_token = Column(String, nullable=True)
+    # Secrets are deferred: plain `select(User)` never ships them; load them with
+    # `undefer(User.hashed_password)` / `undefer(User.verification_token)` where needed.
+    verification_token: Mapped[str] = mapped_column(String, nullable=True, deferred=True)
     email_verified: Mapped[bool] = Column(Boolean, default=False, nullable=False)
-    hashed_password: Mapped[str] = Column(String(255), nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False, deferred=True)
 
 
     def __repr__(self) -> str:
@@ -101,3 +124,4 @@ class User(Base):
         self.professional_status_updated_at = func.now()
 
     invitations_sent = relationship("Invitation", back_populates="inviter", cascade="all, delete-orphan")
+
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request
+from starlette.responses import JSONResponse
+
+router = APIRouter()
+
+@router.get("/health/live", tags=["Health"])
+async def live():
+    """Liveness: the process is up and serving its event loop. Never touches dependencies."""
+    return {"status": "alive"}
+
+@router.get("/health/ready", tags=["Health"])
+async def ready(request: Request):
+    """
+    Readiness from the latest background probe results: 200 once the required
+    dependencies (the database by default) have answered, 503 until then.
+    """
+    monitor = getattr(request.app.state, "health_monitor", None)
+    if monitor is None:
+        return JSONResponse(status_code=503, content={"status": "starting", "required": [], "checks": {}})
+    report = monitor.report()
+    return JSONResponse(status_code=200 if monitor.is_ready() else 503, content=report)
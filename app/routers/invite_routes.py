@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import RedirectResponse
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 import base64
 from app.schemas.invite_schemas import InviteRequest, InviteResponse
-from app.dependencies import get_db, get_current_user, get_email_service, get_settings
+from app.dependencies import get_db, get_read_db, get_current_user, get_email_service, get_settings
 from app.services.invite_service import create_invite
 from app.models.user_model import User
 from app.models.invitation_model import Invitation
@@ -22,29 +22,8 @@ async def invite_user(
 ):
     """
     Invite a user via email, generate a QR code, and store the invite.
+    Self-invites return 400 and duplicate pending invites return 409.
     """
-
-    # 🔐 Validation 1: Prevent self-invite
-    if invite_data.email == current_user.email:
-        raise HTTPException(
-            status_code=400,
-            detail="You cannot invite yourself."
-        )
-
-    # 🔐 Validation 2: Prevent duplicate pending invite
-    result = await db.execute(
-        select(Invitation).where(
-            Invitation.invitee_email == invite_data.email,
-            Invitation.status == "pending"
-        )
-    )
-    existing_invite = result.scalars().first()
-    if existing_invite:
-        raise HTTPException(
-            status_code=409,
-            detail="An active invite has already been sent to this email."
-        )
-
     return await create_invite(db, invite_data, current_user, email_service, settings)
 
 
@@ -64,34 +43,35 @@ async def accept_invite(
         raise HTTPException(status_code=400, detail="Invalid reference string")
 
     result = await db.execute(
-        select(Invitation).where(
+        update(Invitation)
+        .where(
             Invitation.invitee_email == invitee_email,
             Invitation.status == "pending"
         )
+        .values(status="accepted", accepted=True)
+        .returning(Invitation.invitee_email)
     )
-    invite = result.scalars().first()
-    if not invite:
+    accepted_email = result.scalar_one_or_none()
+    if not accepted_email:
         raise HTTPException(status_code=404, detail="Invite not found")
-
-    invite.status = "accepted"
-    invite.accepted = True
     await db.commit()
 
-    return {"message": "Invite accepted", "email": invite.invitee_email}
+    return {"message": "Invite accepted", "email": accepted_email}
 
 
 @router.get("/me/invites")
 async def get_my_invites(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get a count of invites sent and accepted by the logged-in user.
     """
     result = await db.execute(
-        select(Invitation).where(Invitation.inviter_id == current_user.id)
+        select(
+            func.count(),
+            func.count().filter(Invitation.status == "accepted"),
+        ).where(Invitation.inviter_id == current_user.id)
     )
-    invites = result.scalars().all()
-    sent = len(invites)
-    accepted = sum(1 for i in invites if i.status == "accepted")
+    sent, accepted = result.one()
     return {"sent": sent, "accepted": accepted}
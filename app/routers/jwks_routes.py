@@ -0,0 +1,50 @@
+import hashlib
+import json
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel
+
+from app.dependencies import require_role
+from app.models.user_model import User
+from app.services.jwt_service import get_keyring, reload_keyring, uses_asymmetric_keys
+from settings.config import settings
+
+router = APIRouter()
+
+@router.get("/.well-known/jwks.json", tags=["Keys"])
+async def jwks(request: Request):
+    """
+    Public keys that verify our access tokens, for services and gateways to check them locally.
+
+    The body only changes when keys rotate, so it is served with Cache-Control and an ETag.
+    With HS256 there are no public keys and the set is empty.
+    """
+    keys = get_keyring().jwks() if uses_asymmetric_keys() else {"keys": []}
+    body = json.dumps(keys, sort_keys=True).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    headers = {"Cache-Control": f"public, max-age={settings.jwks_max_age_seconds}", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+class KeyReloadRequest(BaseModel):
+    active_kid: Optional[str] = None
+
+@router.post("/keys/reload", tags=["Keys"])
+async def reload_keys(
+    reload_request: KeyReloadRequest,
+    current_user: User = Depends(require_role(["ADMIN"]))
+):
+    """
+    Reload the signing keys from `jwt_keys_dir` in this worker, signing with `active_kid`
+    (or the configured JWT_ACTIVE_KID) from now on. Call it on every worker, or send each one SIGHUP.
+    """
+    if not uses_asymmetric_keys():
+        raise HTTPException(status_code=400, detail="Tokens are signed with a shared secret; there are no keys to reload.")
+    try:
+        keyring = reload_keyring(reload_request.active_kid)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"active_kid": keyring.active_kid, "kids": sorted(keyring.public_keys)}
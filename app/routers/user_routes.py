@@ -1,33 +1,77 @@
 from builtins import dict, int, len, str
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
-from app.dependencies import get_current_user, get_db, get_email_service, require_role, get_settings
+from app.dependencies import get_current_user, get_db, get_read_db, get_email_service, require_role, get_settings
 from app.schemas.pagination_schema import EnhancedPagination
-from app.schemas.token_schema import TokenResponse
+from app.schemas.token_schema import RefreshRequest, TokenResponse
 from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserResponse, UserUpdate
-from app.services.user_service import UserService
+from app.services.user_service import UserConflict, UserService
 from app.services.jwt_service import create_access_token
+from app.services.refresh_token_service import RefreshTokenService
+from app.utils.cursor import encode_cursor
 from app.utils.link_generation import create_user_links, generate_pagination_links
 from app.services.email_service import EmailService
-from app.models.user_model import User
+from app.models.user_model import User, UserRole
 
 router = APIRouter()
 security = HTTPBearer()
 settings = get_settings()
 
+@router.get("/users/search", response_model=UserListResponse, name="search_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def search_users(
+    request: Request,
+    q: Optional[str] = Query(None, min_length=2, description="Fragment of nickname or email"),
+    role: Optional[UserRole] = None,
+    email_verified: Optional[bool] = None,
+    is_locked: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(require_role(["ADMIN", "MANAGER"]))
+):
+    """
+    Search users by nickname/email fragment, role, verification or lock status and
+    creation range. Results are ordered by creation time and paged with `cursor`.
+    """
+    filters = dict(
+        q=q, role=role, email_verified=email_verified, is_locked=is_locked,
+        created_from=created_from, created_to=created_to,
+    )
+    try:
+        users, next_cursor, prev_cursor = await UserService.search(db, limit, cursor, **filters)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    total, total_is_approximate = await UserService.count_rows(db, User, *UserService.search_criteria(**filters))
+
+    user_responses = [UserResponse.model_validate(user) for user in users]
+    return UserListResponse(
+        items=user_responses,
+        total=total,
+        total_is_approximate=total_is_approximate,
+        page=None,
+        size=len(user_responses),
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        links=generate_pagination_links(request, None, limit, total, next_cursor, prev_cursor)
+    )
+
 @router.get("/users/{user_id}", response_model=UserResponse, name="get_user", tags=["User Management Requires (Admin or Manager Roles)"])
 async def get_user(
     user_id: UUID,
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     credentials: HTTPAuthorizationCredentials = Depends(security),
     current_user: User = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    user = await UserService.get_by_id(db, user_id)
+    user = await UserService.get_by_id(db, user_id, projection=True)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -57,8 +101,10 @@ async def update_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     current_user: User = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    user_data = user_update.model_dump(exclude_unset=True)
-    updated_user = await UserService.update(db, user_id, user_data)
+    try:
+        updated_user = await UserService.update(db, user_id, user_update)
+    except UserConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     if not updated_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -100,13 +146,9 @@ async def create_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     current_user: User = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    existing_user = await UserService.get_by_email(db, user.email)
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
-
     created_user = await UserService.create(db, user, email_service)
     if not created_user:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create user")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
 
     return UserResponse.model_construct(
         id=created_user.id,
@@ -128,19 +170,42 @@ async def list_users(
     request: Request,
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     credentials: HTTPAuthorizationCredentials = Depends(security),
     current_user: User = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    total_users = await UserService.count(db)
-    users = await UserService.list_users(db, skip, limit)
+    """
+    List users ordered by creation time.
+
+    Pass `cursor` (from `next_cursor`/`prev_cursor` of a previous page) for keyset
+    pagination, whose cost does not grow with depth. `skip`/`limit` still works.
+    """
+    total_users, total_is_approximate = await UserService.count_rows(db, User)
+    if cursor:
+        try:
+            users, next_cursor, prev_cursor = await UserService.list_users_keyset(db, limit, cursor, projection=True)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        page = None
+        pagination_links = generate_pagination_links(request, None, limit, total_users, next_cursor, prev_cursor)
+    else:
+        users = await UserService.list_users(db, skip, limit, projection=True)
+        last = users[-1] if users else None
+        next_cursor = encode_cursor(last.created_at, last.id) if last and skip + limit < total_users else None
+        prev_cursor = None
+        page = skip // limit + 1
+        pagination_links = generate_pagination_links(request, skip, limit, total_users)
+
     user_responses = [UserResponse.model_validate(user) for user in users]
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
     return UserListResponse(
         items=user_responses,
         total=total_users,
-        page=skip // limit + 1,
+        total_is_approximate=total_is_approximate,
+        page=page,
         size=len(user_responses),
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
         links=pagination_links
     )
 
@@ -160,19 +225,40 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(get_db)
 ):
-    if await UserService.is_account_locked(session, form_data.username):
+    user, locked, refresh_token = await UserService.login(session, form_data.username, form_data.password)
+    if locked:
         raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
-
-    user = await UserService.login_user(session, form_data.username, form_data.password)
     if user:
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-        access_token = create_access_token(
-            data={"sub": user.email, "role": str(user.role.name)},
-            expires_delta=access_token_expires
-        )
-        return {"access_token": access_token, "token_type": "bearer"}
+        return token_response(user, refresh_token)
     raise HTTPException(status_code=401, detail="Incorrect email or password.")
 
+@router.post("/token/refresh", response_model=TokenResponse, tags=["Login and Registration"])
+async def refresh_access_token(
+    refresh_request: RefreshRequest,
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+
+    Each refresh token works once. Reusing one revokes every token issued from the same login.
+    """
+    user, refresh_token = await RefreshTokenService.rotate(session, refresh_request.refresh_token)
+    if not user:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or expired refresh token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token_response(user, refresh_token)
+
+def token_response(user: User, refresh_token: str) -> dict:
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    access_token = create_access_token(
+        data={"sub": str(user.id), "role": str(user.role.name), "ver": user.token_version},
+        expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
 @router.get("/verify-email/{user_id}/{token}", status_code=status.HTTP_200_OK, name="verify_email", tags=["Login and Registration"])
 async def verify_email(
     user_id: UUID,
@@ -6,6 +6,7 @@ from enum import Enum
 import uuid
 import re
 from app.models.user_model import UserRole
+from app.schemas.pagination_schema import PaginationLink
 from app.utils.nickname_gen import generate_nickname
 
 
@@ -79,5 +80,9 @@ class UserListResponse(BaseModel):
         "github_profile_url": "https://github.com/johndoe"
     }])
     total: int = Field(..., example=100)
-    page: int = Field(..., example=1)
+    total_is_approximate: bool = Field(False, description="True when total is an estimate or a cached count.")
+    page: Optional[int] = Field(None, example=1, description="Page number; null for cursor pages.")
     size: int = Field(..., example=10)
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, ordered by (created_at, id).")
+    prev_cursor: Optional[str] = Field(None, description="Opaque cursor for the previous page.")
+    links: List[PaginationLink] = Field(default_factory=list)
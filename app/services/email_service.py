@@ -1,57 +1,194 @@
 from builtins import ValueError, dict, str
+import asyncio
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+from sqlalchemy import select, tuple_
 from settings.config import settings
-from app.utils.smtp_connection import SMTPClient
+from app.database import Database
+from app.utils.rate_limiter import RateLimiter
+from app.utils.smtp_connection import get_smtp_client
 from app.utils.template_manager import TemplateManager
 from app.models.user_model import User
 import logging
 
 logger = logging.getLogger(__name__)
 
+class BulkSendReport:
+    """Progress and outcome of a bulk send; `failures` lists (email, error) per failed recipient."""
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.failures: List[Tuple[str, str]] = []
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rate(self) -> float:
+        """Messages handled per second so far."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "messages_per_second": round(self.rate, 1),
+            "failures": self.failures,
+        }
+
+
+def default_recipient_data(user: User) -> dict:
+    return {"name": user.first_name, "email": user.email}
+
+
 class EmailService:
     def __init__(self, template_manager: TemplateManager):
-        self.smtp_client = SMTPClient(
-            server=settings.smtp_server,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password
-        )
+        self.smtp_client = get_smtp_client()
         self.template_manager = template_manager
 
-    async def send_user_email(self, user_data: dict, email_type: str):
-        subject_map = {
-            'email_verification': "Verify Your Account",
-            'password_reset': "Password Reset Instructions",
-            'account_locked': "Account Locked Notification"
-        }
+    SUBJECTS = {
+        'email_verification': "Verify Your Account",
+        'password_reset': "Password Reset Instructions",
+        'account_locked': "Account Locked Notification",
+        'invitation': "You're Invited"
+    }
 
-        if email_type not in subject_map:
+    async def deliver_user_email(self, user_data: dict, email_type: str):
+        """Render and send one email, raising on failure (the outbox relay retries)."""
+        if email_type not in self.SUBJECTS:
             raise ValueError("Invalid email type")
 
         # ✅ Skip sending real emails in test mode (e.g., example.com)
         if user_data["email"].endswith("@example.com"):
-            print(f"📧 [TEST MODE] Email to: {user_data['email']} | Type: {email_type}")
-            logger.info(f"[TEST MODE] Would send email to {user_data['email']} with subject: {subject_map[email_type]}")
+            logger.info(f"[TEST MODE] Would send email to {user_data['email']} with subject: {self.SUBJECTS[email_type]}")
             return
 
+        html_content = self.template_manager.render_template(email_type, **user_data)
+        await self.smtp_client.send_email_async(self.SUBJECTS[email_type], html_content, user_data['email'])
+        logger.info(f"✅ Email sent to {user_data['email']} for {email_type}")
+
+    async def send_user_email(self, user_data: dict, email_type: str):
+        if email_type not in self.SUBJECTS:
+            raise ValueError("Invalid email type")
         try:
-            html_content = self.template_manager.render_template(email_type, **user_data)
-            self.smtp_client.send_email(subject_map[email_type], html_content, user_data['email'])
-            logger.info(f"✅ Email sent to {user_data['email']} for {email_type}")
+            await self.deliver_user_email(user_data, email_type)
         except Exception as e:
             logger.error(f"❌ Failed to send {email_type} email to {user_data['email']}: {e}")
 
-    async def send_verification_email(self, user: User):
-        # Build the verification URL
+    @staticmethod
+    def verification_email_data(user: User) -> dict:
         verification_url = f"{settings.server_base_url}verify-email/{user.id}/{user.verification_token}"
-
-        # Optionally create a QR code version (for now just use the same URL in both)
-        qr_code_url = f"{settings.server_base_url}verify-email/{user.id}/{user.verification_token}"
-
-        print(f"📧 Sending verification to {user.email} with URL: {verification_url}")
-
-        await self.send_user_email({
+        return {
             "name": user.first_name,
             "email": user.email,
             "verification_url": verification_url,
-            "qr_code_url": qr_code_url  # ✅ Add this for use in template
-        }, 'email_verification')
+            "qr_code_url": verification_url  # ✅ Same URL, rendered as a QR code by the template
+        }
+
+    async def send_verification_email(self, user: User):
+        await self.send_user_email(self.verification_email_data(user), 'email_verification')
+
+    async def send_bulk(
+        self,
+        email_type: str,
+        criteria: Sequence = (),
+        recipient_data: Callable[[User], dict] = default_recipient_data,
+        subject: Optional[str] = None,
+        rate_per_second: Optional[float] = None,
+        progress: Optional[Callable[[BulkSendReport], None]] = None,
+        progress_every: int = 100,
+        batch_size: int = 500,
+        active_only: bool = True,
+        max_recipients: Optional[int] = None,
+        session_factory=None,
+    ) -> BulkSendReport:
+        """
+        Send one template to every user matching `criteria` (default: all users).
+
+        Locked and unverified accounts are skipped unless `active_only` is False.
+        Recipients are read in `(created_at, id)` keyset pages of `batch_size`, each in
+        its own short session, so no connection or snapshot is held while mail goes out.
+        The template is compiled once, and messages go out over the pooled SMTP
+        connections (one worker per connection) at no more than `rate_per_second`. A
+        failure is recorded against its recipient and the campaign carries on.
+        `progress` is called with the running report every `progress_every` recipients
+        and once at the end.
+        """
+        if subject is None:
+            if email_type not in self.SUBJECTS:
+                raise ValueError("Invalid email type")
+            subject = self.SUBJECTS[email_type]
+        template = self.template_manager.get_compiled(email_type)
+        if rate_per_second is None:
+            rate_per_second = settings.bulk_email_rate_per_second
+        if session_factory is None:
+            session_factory = Database.get_session_factory()
+        criteria = list(criteria)
+        if active_only:
+            criteria += [User.is_locked.is_(False), User.email_verified.is_(True)]
+        limiter = RateLimiter(rate_per_second, burst=self.smtp_client.pool.max_size)
+        workers = self.smtp_client.pool.max_size
+        queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        report = BulkSendReport()
+
+        async def send_one(data: dict):
+            try:
+                html_content = template.render(**data)
+                await limiter.acquire()
+                await self.smtp_client.send_email_async(subject, html_content, data["email"])
+                report.sent += 1
+            except Exception as e:
+                report.failed += 1
+                report.failures.append((data.get("email"), str(e)))
+            if progress and report.processed % progress_every == 0:
+                progress(report)
+
+        async def worker():
+            while True:
+                data = await queue.get()
+                try:
+                    if data is None:
+                        return
+                    await send_one(data)
+                finally:
+                    queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            position = None
+            remaining = max_recipients
+            while remaining is None or remaining > 0:
+                page_size = batch_size if remaining is None else min(batch_size, remaining)
+                query = select(User).where(*criteria).order_by(User.created_at, User.id).limit(page_size)
+                if position is not None:
+                    query = query.where(tuple_(User.created_at, User.id) > tuple_(*position))
+                async with session_factory() as session:
+                    users = (await session.execute(query)).scalars().all()
+                    batch = [recipient_data(user) for user in users]
+                for data in batch:
+                    await queue.put(data)
+                if len(users) < page_size:
+                    break
+                position = (users[-1].created_at, users[-1].id)
+                if remaining is not None:
+                    remaining -= len(users)
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        report.finished = time.monotonic()
+        logger.info(f"Bulk {email_type} email: {report.sent} sent, {report.failed} failed in {report.elapsed:.1f}s")
+        if progress:
+            progress(report)
+        return report
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import text
+
+from app.database import Database
+from settings.config import settings as default_settings
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[], Awaitable[None]]
+
+
+async def probe_database(warm_connections: int = 1):
+    """SELECT 1 on `warm_connections` pooled connections at once, leaving them open in the pool."""
+    engine = Database.get_engine()
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(max(1, warm_connections))))
+
+
+async def probe_smtp():
+    """Check out a pooled SMTP connection and NOOP it (this also opens the first connection)."""
+    from app.utils.smtp_connection import get_smtp_client
+
+    def check():
+        pool = get_smtp_client().pool
+        connection = pool.acquire()
+        try:
+            connection.noop()
+        except Exception:
+            pool.release(connection, broken=True)
+            raise
+        pool.release(connection)
+
+    await asyncio.to_thread(check)
+
+
+async def probe_minio():
+    from app.utils.minio_client import minio_client
+
+    if not await asyncio.to_thread(minio_client.bucket_exists, default_settings.minio_bucket):
+        raise LookupError(f"MinIO bucket {default_settings.minio_bucket!r} does not exist")
+
+
+class ProbeResult:
+    def __init__(self):
+        self.status = "unknown"
+        self.error: Optional[str] = None
+        self.latency_ms: Optional[float] = None
+        self.checked_at: Optional[datetime] = None
+        self.consecutive_failures = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "error": self.error,
+            "latency_ms": self.latency_ms,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class HealthMonitor:
+    """
+    Runs dependency probes in the background and keeps their latest results.
+
+    Probes never run on the request path: `/health/ready` only reads the results.
+    Each probe records its outcome as soon as it finishes, so a slow SMTP server does
+    not hold back readiness once the database has answered. Only the probes listed in
+    `required` gate readiness; the others are reported for visibility.
+    """
+
+    def __init__(self, probes: Dict[str, Probe], required: Iterable[str] = ("database",),
+                 interval: float = 15.0, timeout: float = 5.0):
+        self.probes = probes
+        self.required = [name for name in required if name in probes]
+        self.interval = interval
+        self.timeout = timeout
+        self.results = {name: ProbeResult() for name in probes}
+        self._stop: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls, settings=default_settings) -> "HealthMonitor":
+        available = {
+            "database": lambda: probe_database(settings.health_db_warm_connections),
+            "smtp": probe_smtp,
+            "minio": probe_minio,
+        }
+        probes = {name: available[name] for name in settings.health_probes if name in available}
+        return cls(
+            probes,
+            required=settings.health_ready_probes,
+            interval=settings.health_probe_interval_seconds,
+            timeout=settings.health_probe_timeout_seconds,
+        )
+
+    async def check(self, name: str):
+        result = self.results[name]
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.probes[name](), self.timeout)
+        except Exception as e:
+            error = f"timed out after {self.timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e) or repr(e)
+            if result.status != "failing":
+                logger.warning(f"Health probe {name} failing: {error}")
+            result.status = "failing"
+            result.error = error
+            result.consecutive_failures += 1
+        else:
+            if result.status == "failing":
+                logger.info(f"Health probe {name} recovered")
+            result.status = "ok"
+            result.error = None
+            result.consecutive_failures = 0
+        result.latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        result.checked_at = datetime.now(timezone.utc)
+
+    async def run_once(self):
+        await asyncio.gather(*(self.check(name) for name in self.probes))
+
+    async def run_forever(self, stop: asyncio.Event):
+        while not stop.is_set():
+            await self.run_once()
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self.run_forever(self._stop))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        # Probes blocked on a dead dependency are abandoned rather than awaited
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def is_ready(self) -> bool:
+        return all(self.results[name].status == "ok" for name in self.required)
+
+    def report(self) -> dict:
+        return {
+            "status": "ready" if self.is_ready() else "not_ready",
+            "required": self.required,
+            "checks": {name: result.as_dict() for name, result in self.results.items()},
+        }
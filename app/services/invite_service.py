@@ -1,15 +1,24 @@
 from app.models.invitation_model import Invitation
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.utils.qr_generator import generate_qr_code
-from app.utils.minio_client import upload_qr
+from app.utils.minio_client import new_qr_object_name, qr_object_url, upload_qr
 from app.services.email_service import EmailService
+from app.services.outbox_service import enqueue_email
 from app.models.user_model import User
 from app.schemas.invite_schemas import InviteRequest
 from settings.config import Settings
 import base64
-from sqlalchemy import select
 from fastapi import HTTPException, status
 
+def _insert_invitation(db: AsyncSession):
+    """Dialect-specific INSERT so ON CONFLICT is available on Postgres and SQLite."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(Invitation)
+    return pg_insert(Invitation)
+
 async def create_invite(
     db: AsyncSession,
     invite_data: InviteRequest,
@@ -24,15 +33,24 @@ async def create_invite(
             detail="You cannot invite yourself."
         )
 
-    # Validation 2: Prevent duplicate pending invite
-    result = await db.execute(
-        select(Invitation).where(
-            Invitation.invitee_email == invite_data.email,
-            Invitation.status == "pending"
+    # Create Invitation. A duplicate pending invite hits the partial unique index and
+    # ON CONFLICT inserts nothing, so this is a single INSERT with no pre-check query.
+    qr_object_name = new_qr_object_name()
+    query = (
+        _insert_invitation(db)
+        .values(
+            inviter_id=inviter.id,
+            invitee_email=invite_data.email,
+            qr_code_url=qr_object_url(qr_object_name),
+            status="pending",
+            accepted=False,
         )
+        .on_conflict_do_nothing(index_elements=[Invitation.invitee_email], index_where=text("status = 'pending'"))
+        .returning(Invitation)
     )
-    existing_invite = result.scalars().first()
-    if existing_invite:
+    invite = (await db.execute(query)).scalars().first()
+    if invite is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="An active invite has already been sent to this email."
@@ -41,28 +59,16 @@ async def create_invite(
     # Encode invitee email for QR code reference
     encoded_email = base64.urlsafe_b64encode(invite_data.email.encode()).decode()
 
-    # Generate QR code with reference
+    # Generate and upload the QR code only once the invite is known to be unique
     buffer = generate_qr_code(encoded_email, settings.invite_base_url)
-    qr_url = upload_qr(buffer)
-
-    # Create Invitation
-    invite = Invitation(
-        inviter_id=inviter.id,
-        invitee_email=invite_data.email,
-        qr_code_url=qr_url,
-        status="pending",
-        accepted=False
-    )
+    upload_qr(buffer, qr_object_name)
 
-    db.add(invite)
-    await db.commit()
-    await db.refresh(invite)
-
-    # Send invitation email
-    await email_service.send_user_email({
+    # Queue the invitation email in the same transaction as the invite
+    enqueue_email(db, {
         "name": inviter.first_name,
         "email": invite_data.email,
-        "qr_code_url": qr_url
-    }, 'email_verification')
+        "qr_code_url": invite.qr_code_url
+    }, 'invitation')
+    await db.commit()
 
     return invite
@@ -1,9 +1,102 @@
+import json
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from pathlib import Path
+from typing import Any, Optional, Dict, List
 import jwt
 from jwt import PyJWTError
+from jwt.algorithms import get_default_algorithms
 
-from settings.config import settings
+from app.utils.ttl_cache import TTLCache
+from settings.config import Settings, settings
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "PS256", "ES256", "ES384", "EdDSA"}
+
+class KeyRing:
+    """
+    Signing and verification keys for asymmetric JWTs, loaded once from `jwt_keys_dir`.
+
+    Every `<kid>.pem` private key in the directory can verify tokens, and the one
+    named by `jwt_active_kid` signs new ones. A retired key can be kept as a public
+    `<kid>.pub.pem` so tokens it signed still verify until they expire. To rotate
+    without a restart, add the new private key, then either `POST /keys/reload` with
+    its kid (as an admin) or set JWT_ACTIVE_KID in the environment/.env and send the
+    worker SIGHUP; both call `reload_keyring()`. Old keys stay in the JWKS until removed.
+    """
+
+    def __init__(self, keys_dir: str, active_kid: str, algorithm: str):
+        from cryptography.hazmat.primitives import serialization
+
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self.signing_key = None
+        self.public_keys: Dict[str, Any] = {}
+        for path in sorted(Path(keys_dir).glob("*.pem")):
+            data = path.read_bytes()
+            if path.name.endswith(".pub.pem"):
+                kid = path.name[: -len(".pub.pem")]
+                self.public_keys[kid] = serialization.load_pem_public_key(data)
+            else:
+                kid = path.stem
+                private_key = serialization.load_pem_private_key(data, password=None)
+                self.public_keys[kid] = private_key.public_key()
+                if kid == active_kid:
+                    self.signing_key = private_key
+        if self.signing_key is None:
+            raise ValueError(f"No private key for jwt_active_kid '{active_kid}' in {keys_dir}")
+        self._jwks = self._build_jwks()
+
+    def _build_jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        algorithm = get_default_algorithms()[self.algorithm]
+        keys = []
+        for kid, public_key in self.public_keys.items():
+            jwk = json.loads(algorithm.to_jwk(public_key))
+            jwk.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+            keys.append(jwk)
+        return {"keys": keys}
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self._jwks
+
+    def verification_key(self, token: str):
+        """Public key named by the token's `kid` header, or None if it is not in the ring."""
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except PyJWTError:
+            return None
+        return self.public_keys.get(kid)
+
+
+_keyring: Optional[KeyRing] = None
+_keyring_lock = threading.Lock()
+
+def uses_asymmetric_keys() -> bool:
+    return settings.jwt_algorithm in ASYMMETRIC_ALGORITHMS
+
+def get_keyring() -> KeyRing:
+    global _keyring
+    with _keyring_lock:
+        if _keyring is None:
+            _keyring = KeyRing(settings.jwt_keys_dir, settings.jwt_active_kid, settings.jwt_algorithm)
+        return _keyring
+
+def reload_keyring(active_kid: Optional[str] = None) -> KeyRing:
+    """
+    Reload keys from disk (after a rotation) and drop cached verifications.
+
+    Signs with `active_kid` from now on, or, when it is not given, with `jwt_active_kid`
+    as currently set in the environment/.env. The old ring stays in use if loading fails.
+    """
+    global _keyring
+    if active_kid is None:
+        active_kid = Settings().jwt_active_kid
+    keyring = KeyRing(settings.jwt_keys_dir, active_kid, settings.jwt_algorithm)
+    with _keyring_lock:
+        settings.jwt_active_kid = active_kid
+        _keyring = keyring
+    _token_cache.clear()
+    return keyring
 
 def create_access_token(data: Dict[str, str], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -15,11 +108,72 @@ def create_access_token(data: Dict[str, str], expires_delta: Optional[timedelta]
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
     to_encode.update({"exp": expire})
     
+    if uses_asymmetric_keys():
+        keyring = get_keyring()
+        return jwt.encode(
+            to_encode, keyring.signing_key, algorithm=settings.jwt_algorithm, headers={"kid": keyring.active_kid}
+        )
     encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
+class TokenCache:
+    """
+    Bounded LRU of verified token claims, keyed by the exact token string.
+
+    Each entry expires at the token's `exp`. Only tokens that passed signature and
+    claim verification are stored, so a flood of forged tokens only counts misses,
+    and the least recently used entry is evicted once `max_size` is reached.
+    """
+
+    def __init__(self, max_size: int):
+        self._cache = TTLCache(max_size, clock=time.time)
+
+    @property
+    def max_size(self) -> int:
+        return self._cache.max_size
+
+    def get(self, token: str) -> Optional[Dict[str, str]]:
+        claims = self._cache.get(token)
+        return dict(claims) if claims is not None else None
+
+    def put(self, token: str, claims: Dict[str, str]):
+        expires_at = claims.get("exp")
+        if isinstance(expires_at, (int, float)):
+            self._cache.put(token, dict(claims), expires_at=expires_at)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+
+_token_cache = TokenCache(settings.jwt_cache_size)
+
+def get_token_cache() -> TokenCache:
+    return _token_cache
+
+def configure_token_cache(max_size: int) -> TokenCache:
+    """Replace the verified-token cache (0 disables caching), e.g. after rotating keys."""
+    global _token_cache
+    _token_cache = TokenCache(max_size)
+    return _token_cache
+
 def decode_token(token: str) -> Optional[Dict[str, str]]:
+    cache = _token_cache
+    if cache.max_size > 0:
+        claims = cache.get(token)
+        if claims is not None:
+            return claims
+    if uses_asymmetric_keys():
+        key = get_keyring().verification_key(token)
+        if key is None:
+            return None
+    else:
+        key = settings.jwt_secret_key
     try:
-        return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        claims = jwt.decode(token, key, algorithms=[settings.jwt_algorithm])
     except PyJWTError:
         return None
+    cache.put(token, claims)
+    return claims
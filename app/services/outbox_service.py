@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import Database
+from app.models.outbox_model import OutboxMessage
+from settings.config import settings as default_settings
+
+logger = logging.getLogger(__name__)
+
+EMAIL = "email"
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class ClaimedMessage(NamedTuple):
+    id: Any
+    kind: str
+    payload: dict
+    attempts: int  # including the delivery about to start
+
+
+def enqueue(session: AsyncSession, kind: str, payload: dict) -> OutboxMessage:
+    """Record a side effect in the caller's transaction; it is delivered only if that transaction commits."""
+    message = OutboxMessage(kind=kind, payload=payload, status="pending", attempts=0)
+    session.add(message)
+    return message
+
+
+def enqueue_email(session: AsyncSession, user_data: dict, email_type: str) -> OutboxMessage:
+    return enqueue(session, EMAIL, {"user_data": user_data, "email_type": email_type})
+
+
+def redact_payload(kind: str, payload: dict) -> dict:
+    """What is kept of a delivered message: enough to audit it, no secrets such as verification links."""
+    if kind == EMAIL:
+        return {"email_type": payload.get("email_type"), "user_data": {"email": payload.get("user_data", {}).get("email")}}
+    return {}
+
+
+async def _send_email(payload: dict):
+    from app.services.email_service import EmailService
+    from app.utils.template_manager import get_template_manager
+    await EmailService(get_template_manager()).deliver_user_email(payload["user_data"], payload["email_type"])
+
+
+class OutboxRelay:
+    """
+    Drains the outbox in batches.
+
+    Each pass claims up to `batch_size` due messages with `FOR UPDATE SKIP LOCKED`
+    (so several app instances can relay side by side), marks them `sending` with a
+    lease of `claim_timeout` seconds and commits. The messages are then delivered
+    concurrently with no transaction open, and the outcomes are recorded in a second
+    short transaction. A message whose relay died mid-send is picked up again once its
+    lease expires. A failed message is retried after exponential backoff with jitter.
+    `attempts` is counted when a message is claimed, so after `max_attempts` deliveries
+    (failed, or lost to a crashed or hung relay) the message is marked `dead`. Delivered messages
+    keep only a redacted payload, and old `sent` and `dead` rows are pruned.
+    """
+
+    def __init__(self, handlers: Optional[Dict[str, Handler]] = None, session_factory=None,
+                 batch_size: int = 20, max_attempts: int = 8, backoff_base: float = 5.0,
+                 backoff_max: float = 900.0, poll_interval: float = 1.0, claim_timeout: float = 300.0,
+                 sent_retention: timedelta = timedelta(days=7), dead_retention: timedelta = timedelta(days=30),
+                 prune_interval: float = 3600.0):
+        self.handlers = handlers if handlers is not None else {EMAIL: _send_email}
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.claim_timeout = claim_timeout
+        self.sent_retention = sent_retention
+        self.dead_retention = dead_retention
+        self.prune_interval = prune_interval
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self.pruned = 0
+        self._stop: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls, settings=default_settings, **kwargs) -> "OutboxRelay":
+        return cls(
+            batch_size=settings.outbox_batch_size,
+            max_attempts=settings.outbox_max_attempts,
+            backoff_base=settings.outbox_backoff_base_seconds,
+            backoff_max=settings.outbox_backoff_max_seconds,
+            poll_interval=settings.outbox_poll_interval_seconds,
+            claim_timeout=settings.outbox_claim_timeout_seconds,
+            sent_retention=timedelta(days=settings.outbox_sent_retention_days),
+            dead_retention=timedelta(days=settings.outbox_dead_retention_days),
+            prune_interval=settings.outbox_prune_interval_seconds,
+            **kwargs,
+        )
+
+    @property
+    def session_factory(self):
+        return self._session_factory or Database.get_session_factory()
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retry number `attempts`: base * 2^(attempts-1), capped, with up to 10% jitter."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.9, 1.0)
+
+    async def _deliver(self, kind: str, payload: dict) -> Optional[Exception]:
+        handler = self.handlers.get(kind)
+        if handler is None:
+            return LookupError(f"No outbox handler for kind {kind!r}")
+        try:
+            await handler(payload)
+        except Exception as e:
+            return e
+        return None
+
+    async def claim(self) -> List[ClaimedMessage]:
+        """
+        Lease a batch of due messages, count the attempt and commit.
+
+        A message whose lease expired after its last allowed attempt is marked `dead`
+        here instead of being claimed again.
+        """
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            query = (
+                select(OutboxMessage.id, OutboxMessage.kind, OutboxMessage.payload, OutboxMessage.attempts)
+                .where(
+                    or_(OutboxMessage.status == "pending", OutboxMessage.status == "sending"),
+                    OutboxMessage.available_at <= func.now(),
+                )
+                .order_by(OutboxMessage.available_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = (await session.execute(query)).all()
+            exhausted = [row.id for row in rows if row.attempts >= self.max_attempts]
+            claimed = [
+                ClaimedMessage(row.id, row.kind, row.payload, row.attempts + 1)
+                for row in rows if row.attempts < self.max_attempts
+            ]
+            if exhausted:
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(exhausted))
+                    .values(status="dead", last_error="Delivery did not finish before its claim expired")
+                )
+                self.dead += len(exhausted)
+                logger.error(f"Outbox messages {exhausted} are dead: their last delivery never finished")
+            if claimed:
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_([message.id for message in claimed]))
+                    .values(
+                        status="sending",
+                        attempts=OutboxMessage.attempts + 1,
+                        available_at=now + timedelta(seconds=self.claim_timeout),
+                    )
+                )
+            if rows:
+                await session.commit()
+            return claimed
+
+    async def run_once(self) -> int:
+        """Deliver one batch of due messages; returns how many were processed."""
+        claimed = await self.claim()
+        if not claimed:
+            return 0
+
+        errors = await asyncio.gather(*(self._deliver(row.kind, row.payload) for row in claimed))
+
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            for row, error in zip(claimed, errors):
+                outcome = update(OutboxMessage).where(OutboxMessage.id == row.id)
+                if error is None:
+                    await session.execute(outcome.values(
+                        status="sent", sent_at=now, last_error=None, payload=redact_payload(row.kind, row.payload),
+                    ))
+                    self.sent += 1
+                    continue
+                attempts = row.attempts
+                if attempts >= self.max_attempts:
+                    await session.execute(outcome.values(status="dead", last_error=str(error)[:2000]))
+                    self.dead += 1
+                    logger.error(f"Outbox message {row.id} ({row.kind}) is dead after {attempts} attempts: {error}")
+                else:
+                    await session.execute(outcome.values(
+                        status="pending", last_error=str(error)[:2000],
+                        available_at=now + timedelta(seconds=self.backoff(attempts)),
+                    ))
+                    self.retried += 1
+                    logger.warning(f"Outbox message {row.id} ({row.kind}) failed, retry {attempts}: {error}")
+            await session.commit()
+        return len(claimed)
+
+    async def prune(self) -> int:
+        """Delete `sent` messages older than `sent_retention` and `dead` ones older than `dead_retention`."""
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(OutboxMessage).where(or_(
+                    (OutboxMessage.status == "sent") & (OutboxMessage.sent_at < now - self.sent_retention),
+                    (OutboxMessage.status == "dead") & (OutboxMessage.created_at < now - self.dead_retention),
+                ))
+            )
+            await session.commit()
+        self.pruned += result.rowcount
+        return result.rowcount
+
+    async def run_forever(self, stop: asyncio.Event):
+        next_prune = time.monotonic()
+        while not stop.is_set():
+            try:
+                if time.monotonic() >= next_prune:
+                    next_prune = time.monotonic() + self.prune_interval
+                    await self.prune()
+                processed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Outbox relay pass failed: {e}")
+                processed = 0
+            if processed < self.batch_size:
+                # Caught up: sleep until the next poll (or until asked to stop)
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self):
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self.run_forever(self._stop))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"sent": self.sent, "retried": self.retried, "dead": self.dead, "pruned": self.pruned}
@@ -0,0 +1,74 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import inspect
+
+from app.models.user_model import User
+from app.utils.ttl_cache import TTLCache
+from settings.config import settings
+
+# Never keep secrets in the cache.
+EXCLUDED_COLUMNS = {"hashed_password", "verification_token"}
+
+
+class PrincipalCache:
+    """
+    TTL cache of authenticated users, keyed by user id.
+
+    Stores a snapshot of the user's column values and hands back a fresh transient
+    `User` on each hit, so no instance is shared between sessions or requests.
+    Writers call `invalidate` after committing a change so role and lock updates
+    apply on the next request; the TTL bounds staleness for changes made by other
+    processes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self._cache = TTLCache(max_size, ttl_seconds)
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache.ttl_seconds > 0 and self._cache.max_size > 0
+
+    def get(self, user_id: UUID) -> Optional[User]:
+        if not self.enabled:
+            return None
+        snapshot = self._cache.get(user_id)
+        return User(**snapshot) if snapshot is not None else None
+
+    def put(self, user: User):
+        if not self.enabled:
+            return
+        loaded = inspect(user).dict
+        snapshot = {
+            attr.key: loaded[attr.key]
+            for attr in inspect(User).column_attrs
+            if attr.key in loaded and attr.key not in EXCLUDED_COLUMNS
+        }
+        self._cache.put(user.id, snapshot)
+
+    def invalidate(self, user_id: UUID):
+        self._cache.invalidate(user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache(settings.principal_cache_ttl_seconds, settings.principal_cache_size)
+
+# Short-lived `(token_version, is_locked)` per user id for claims-only authorization: a token
+# is honoured while its `ver` claim matches the cached version and the account is unlocked.
+token_version_cache = TTLCache(settings.principal_cache_size, settings.token_version_cache_ttl_seconds)
+
+
+def invalidate_user(user_id: UUID):
+    """Drop every cached authorization fact about a user; call after committing a change to it."""
+    principal_cache.invalidate(user_id)
+    token_version_cache.invalidate(user_id)
+
+
+def clear_all():
+    principal_cache.clear()
+    token_version_cache.clear()
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.refresh_token_model import RefreshToken
+from app.models.user_model import User
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenService:
+    """
+    Issues and rotates refresh tokens.
+
+    Only the SHA-256 of a token is stored, so a refresh is one indexed lookup on
+    `token_hash` instead of a password hash. Every refresh consumes the presented
+    token and issues a new one in the same family; presenting a consumed token again
+    is treated as theft and revokes the family.
+    """
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _new_token(cls, user: User, family_id: UUID) -> Tuple[RefreshToken, str]:
+        token = secrets.token_urlsafe(32)
+        record = RefreshToken(
+            user_id=user.id,
+            family_id=family_id,
+            token_hash=cls.hash_token(token),
+            token_version=user.token_version,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=settings.refresh_token_expire_minutes),
+        )
+        return record, token
+
+    @classmethod
+    async def issue(cls, session: AsyncSession, user: User) -> str:
+        """Start a new token family for `user` (e.g. at login); the caller commits it with the login."""
+        record, token = cls._new_token(user, uuid.uuid4())
+        session.add(record)
+        await session.flush()
+        return token
+
+    @classmethod
+    async def rotate(cls, session: AsyncSession, token: str) -> Tuple[Optional[User], Optional[str]]:
+        """
+        Consume `token` and return `(user, next_token)`, or `(None, None)` if it is not usable.
+
+        The token is consumed with a conditional UPDATE, so two concurrent refreshes
+        with the same token cannot both succeed.
+        """
+        now = datetime.now(timezone.utc)
+        token_hash = cls.hash_token(token)
+        result = await session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+            .returning(RefreshToken.user_id, RefreshToken.family_id, RefreshToken.token_version)
+        )
+        consumed = result.one_or_none()
+        if consumed is None:
+            await cls._revoke_if_reused(session, token_hash, now)
+            return None, None
+
+        user = await session.get(User, consumed.user_id, populate_existing=True)
+        if user is None or user.is_locked or user.token_version != consumed.token_version:
+            await cls.revoke_family(session, consumed.family_id, now)
+            return None, None
+
+        record, next_token = cls._new_token(user, consumed.family_id)
+        session.add(record)
+        await session.commit()
+        return user, next_token
+
+    @classmethod
+    async def _revoke_if_reused(cls, session: AsyncSession, token_hash: str, now: datetime):
+        result = await session.execute(
+            select(RefreshToken.family_id, RefreshToken.user_id).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.used_at.is_not(None),
+                RefreshToken.revoked_at.is_(None),
+            )
+        )
+        reused = result.one_or_none()
+        if reused is None:
+            await session.rollback()
+            return
+        logger.warning(f"Refresh token reuse detected for user {reused.user_id}; revoking family {reused.family_id}")
+        await cls.revoke_family(session, reused.family_id, now)
+
+    @classmethod
+    async def revoke_family(cls, session: AsyncSession, family_id: UUID, now: Optional[datetime] = None):
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now or datetime.now(timezone.utc))
+        )
+        await session.commit()
+
+    @classmethod
+    async def purge_expired(cls, session: AsyncSession) -> int:
+        """
+        Delete expired tokens and commit; returns how many rows were removed.
+
+        Used and revoked tokens are kept until they expire so reuse is still detected.
+        """
+        result = await session.execute(delete(RefreshToken).where(RefreshToken.expires_at <= datetime.now(timezone.utc)))
+        await session.commit()
+        return result.rowcount
+
+
+async def purge_expired_tokens_forever(session_factory, interval: float, stop: asyncio.Event):
+    """Purge expired refresh tokens every `interval` seconds until `stop` is set."""
+    while True:
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            async with session_factory() as session:
+                purged = await RefreshTokenService.purge_expired(session)
+            if purged:
+                logger.info(f"Purged {purged} expired refresh tokens")
+        except Exception as e:
+            logger.error(f"Refresh token purge failed: {e}")
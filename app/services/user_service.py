@@ -1,45 +1,86 @@
 from builtins import Exception, bool, classmethod, int, str
 from datetime import datetime, timezone
 import secrets
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Sequence, Tuple, Union
 from pydantic import ValidationError
-from sqlalchemy import func, update, select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import case, cast, exists, func, or_, update, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer
+from sqlalchemy.orm.attributes import set_committed_value
 from uuid import UUID
 import logging
 
 from app.dependencies import get_email_service, get_settings
 from app.models.user_model import User, UserRole
 from app.schemas.user_schemas import UserCreate, UserUpdate
-from app.utils.nickname_gen import generate_nickname
-from app.utils.security import generate_verification_token, hash_password, verify_password
+from app.utils.cursor import NEXT, PREV, decode_cursor, encode_cursor
+from app.utils.nickname_gen import generate_nickname, generate_nicknames
+from app.utils.ttl_cache import TTLCache
+from app.utils.security import generate_verification_token, hash_password_async, password_needs_rehash, verify_password_async
 from app.services.email_service import EmailService
+from app.services.outbox_service import enqueue_email
+from app.services.principal_cache import invalidate_user
+from app.services.refresh_token_service import RefreshTokenService
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+class UserConflict(ValueError):
+    """Raised when a write would give a user another user's email or nickname."""
+
 class UserService:
+    """
+    User persistence operations.
+
+    Reads never commit. Each write method commits its own unit of work exactly
+    once, so a request performs at most one COMMIT.
+    """
+
+    COUNT_EXACT = "exact"
+    COUNT_CACHED = "cached"
+    COUNT_ESTIMATED = "estimated"
+
+    NICKNAME_ATTEMPTS = 5
+    NICKNAME_BATCH_SIZE = 16
+
+    # Columns needed to build a UserResponse; used by read endpoints to avoid
+    # shipping unused columns (secrets are deferred on the model anyway).
+    RESPONSE_COLUMNS = (
+        User.id, User.nickname, User.email, User.first_name, User.last_name, User.bio,
+        User.profile_picture_url, User.linkedin_profile_url, User.github_profile_url,
+        User.role, User.is_professional, User.last_login_at, User.created_at, User.updated_at,
+    )
+
+    # table name -> bounded TTLCache of query key -> total (count_cache_size entries, count_cache_ttl_seconds each)
+    _count_cache: Dict[str, TTLCache] = {}
+
     @classmethod
     async def _execute_query(cls, session: AsyncSession, query):
         try:
-            result = await session.execute(query)
-            await session.commit()
-            return result
+            return await session.execute(query)
         except SQLAlchemyError as e:
             logger.error(f"Database error: {e}")
             await session.rollback()
             return None
 
     @classmethod
-    async def _fetch_user(cls, session: AsyncSession, **filters) -> Optional[User]:
-        query = select(User).filter_by(**filters)
+    def _response_projection(cls):
+        return load_only(*cls.RESPONSE_COLUMNS)
+
+    @classmethod
+    async def _fetch_user(cls, session: AsyncSession, *options, **filters) -> Optional[User]:
+        query = select(User).options(*options).filter_by(**filters)
         result = await cls._execute_query(session, query)
         return result.scalars().first() if result else None
 
     @classmethod
-    async def get_by_id(cls, session: AsyncSession, user_id: UUID) -> Optional[User]:
-        return await cls._fetch_user(session, id=user_id)
+    async def get_by_id(cls, session: AsyncSession, user_id: UUID, projection: bool = False) -> Optional[User]:
+        """Fetch a user; with `projection=True` only the UserResponse columns are loaded."""
+        options = (cls._response_projection(),) if projection else ()
+        return await cls._fetch_user(session, *options, id=user_id)
 
     @classmethod
     async def get_by_nickname(cls, session: AsyncSession, nickname: str) -> Optional[User]:
@@ -49,69 +90,146 @@ class UserService:
     async def get_by_email(cls, session: AsyncSession, email: str) -> Optional[User]:
         return await cls._fetch_user(session, email=email)
 
+    @staticmethod
+    def _insert(session: AsyncSession, model):
+        """Dialect-specific INSERT so ON CONFLICT is available on Postgres and SQLite."""
+        if session.get_bind().dialect.name == "sqlite":
+            return sqlite_insert(model)
+        return pg_insert(model)
+
     @classmethod
     async def create(cls, session: AsyncSession, user_data: UserCreate, email_service: EmailService) -> Optional[User]:
+        """
+        Create a user with one INSERT ... ON CONFLICT DO NOTHING ... RETURNING.
+
+        Returns None if the email is taken or the data is invalid.
+        """
         try:
-            if isinstance(user_data, dict):
-                user_data = UserCreate(**user_data)
+            user = await cls._insert_user(session, user_data)
+        except ValidationError as e:
+            logger.error(f"Validation error during user creation: {e}")
+            return None
+        if user:
+            await session.commit()
+            cls.invalidate_count_cache()
+        return user
 
-            # ✅ Convert role string to enum if needed
-            user_data.role = UserRole(user_data.role) if isinstance(user_data.role, str) else user_data.role
+    @classmethod
+    async def _insert_user(cls, session: AsyncSession, user_data: UserCreate) -> Optional[User]:
+        """
+        Insert a new user without committing; None if the email already exists.
 
-            validated_data = user_data.model_dump()
+        Only an ON CONFLICT that inserts nothing means a duplicate; any other database
+        error is rolled back and re-raised.
+        """
+        if isinstance(user_data, dict):
+            user_data = UserCreate(**user_data)
 
-            existing_user = await cls.get_by_email(session, validated_data['email'])
-            if existing_user:
-                logger.error("User with given email already exists.")
-                return None
+        # ✅ Convert role string to enum if needed
+        user_data.role = UserRole(user_data.role) if isinstance(user_data.role, str) else user_data.role
 
-            validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
-            new_user = User(**validated_data)
+        values = user_data.model_dump(exclude={'password'})
+        values['hashed_password'] = await hash_password_async(user_data.password)
+        values['verification_token'] = generate_verification_token()
+        if values.get('role'):
+            values['email_verified'] = values['role'] == UserRole.ADMIN
+        else:
+            # First-user bootstrap without counting the table: the very first user becomes ADMIN.
+            is_first_user = ~exists().select_from(User)
+            values['role'] = cast(
+                case((is_first_user, UserRole.ADMIN.value), else_=UserRole.ANONYMOUS.value),
+                User.__table__.c.role.type,
+            )
+            values['email_verified'] = is_first_user
 
-            new_nickname = generate_nickname()
-            while await cls.get_by_nickname(session, new_nickname):
-                new_nickname = generate_nickname()
-            new_user.nickname = new_nickname
+        nickname = generate_nickname()
+        for _ in range(cls.NICKNAME_ATTEMPTS):
+            values['nickname'] = nickname
+            query = cls._insert(session, User).values(**values).on_conflict_do_nothing().returning(User)
+            try:
+                result = await session.execute(query)
+            except SQLAlchemyError as e:
+                logger.error(f"Database error during user creation: {e}")
+                await session.rollback()
+                raise
+            new_user = result.scalars().first()
+            if new_user:
+                # RETURNING skips deferred columns; the token is needed for the verification email.
+                set_committed_value(new_user, 'verification_token', values['verification_token'])
+                return new_user
 
-            user_count = await cls.count(session)
-            if not new_user.role:
-                new_user.role = UserRole.ADMIN if user_count == 0 else UserRole.ANONYMOUS
-            if new_user.role == UserRole.ADMIN:
-                new_user.email_verified = True
+            # Nothing inserted: either the email exists (done) or the nickname collided
+            # (retry with a nickname checked to be free).
+            if await cls.get_by_email(session, values['email']):
+                logger.error("User with given email already exists.")
+                return None
+            nickname = await cls.allocate_nickname(session)
 
-            new_user.verification_token = generate_verification_token()
+        logger.error("Could not allocate a free nickname.")
+        return None
 
-            session.add(new_user)
-            await session.commit()
-            return new_user
+    @classmethod
+    async def allocate_nickname(cls, session: AsyncSession) -> str:
+        """
+        Return a nickname that is currently unused.
 
-        except ValidationError as e:
-            logger.error(f"Validation error during user creation: {e}")
-            return None
+        Each round checks a batch of candidates with one `IN (...)` query, so the
+        cost stays bounded however full the nickname space gets. After
+        NICKNAME_ATTEMPTS rounds a random suffix makes the nickname unique.
+        """
+        for _ in range(cls.NICKNAME_ATTEMPTS):
+            candidates = generate_nicknames(cls.NICKNAME_BATCH_SIZE)
+            result = await session.execute(select(User.nickname).where(User.nickname.in_(candidates)))
+            free = candidates - set(result.scalars().all())
+            if free:
+                return free.pop()
+        return f"{generate_nickname()}_{secrets.token_hex(4)}"
 
     @classmethod
-    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str]) -> Optional[User]:
-        try:
-            validated_data = UserUpdate(**update_data).model_dump(exclude_unset=True)
+    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Union[UserUpdate, Dict[str, str]]) -> Optional[User]:
+        """
+        Apply a partial update with a single `UPDATE ... RETURNING` and commit.
 
-            if 'password' in validated_data:
-                validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
+        Accepts an already validated `UserUpdate` (as the route passes it) or a raw
+        dict, which is validated here. Returns None only if the user does not exist.
 
-            query = (
-                update(User)
-                .where(User.id == user_id)
-                .values(**validated_data)
-                .execution_options(synchronize_session="fetch")
-            )
-            await cls._execute_query(session, query)
-            updated_user = await cls.get_by_id(session, user_id)
-            if updated_user:
-                await session.refresh(updated_user)
-                return updated_user
-            return None
-        except Exception as e:
-            logger.error(f"Error during user update: {e}")
+        Raises:
+            ValidationError: If a raw dict is not a valid update.
+            UserConflict: If the update collides with another user's email or nickname.
+        Anything else (a full hashing pool, a database error) propagates too.
+        """
+        if not isinstance(update_data, UserUpdate):
+            update_data = UserUpdate(**update_data)
+        validated_data = update_data.model_dump(exclude_unset=True)
+
+        if 'password' in validated_data:
+            validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
+        if 'role' in validated_data or 'hashed_password' in validated_data:
+            # Revoke tokens that still carry the old role or were issued before the new password.
+            validated_data['token_version'] = User.token_version + 1
+
+        query = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**validated_data)
+            .returning(User)
+            .execution_options(synchronize_session="fetch", populate_existing=True)
+        )
+        try:
+            result = await session.execute(query)
+        except IntegrityError as e:
+            await session.rollback()
+            raise UserConflict("A user with this email or nickname already exists.") from e
+        except SQLAlchemyError:
+            await session.rollback()
+            raise
+        updated_user = result.scalars().first()
+        if not updated_user:
+            await session.rollback()
             return None
+        await session.commit()
+        invalidate_user(updated_user.id)
+        return updated_user
 
     @classmethod
     async def delete(cls, session: AsyncSession, user_id: UUID) -> bool:
@@ -120,44 +238,217 @@ class UserService:
             return False
         await session.delete(user)
         await session.commit()
+        cls.invalidate_count_cache()
+        invalidate_user(user.id)
         return True
 
     @classmethod
-    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> List[User]:
-        query = select(User).offset(skip).limit(limit)
+    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10, projection: bool = False) -> List[User]:
+        query = select(User).order_by(User.created_at, User.id).offset(skip).limit(limit)
+        if projection:
+            query = query.options(cls._response_projection())
         result = await cls._execute_query(session, query)
         return result.scalars().all() if result else []
 
+    @classmethod
+    async def list_users_keyset(
+        cls,
+        session: AsyncSession,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        projection: bool = False,
+        criteria: Sequence = (),
+    ) -> Tuple[List[User], Optional[str], Optional[str]]:
+        """
+        List users ordered by `(created_at, id)` starting after (or before) `cursor`.
+
+        Cost is independent of how deep the page is, unlike OFFSET. `criteria` are
+        extra WHERE clauses (see `search_criteria`).
+
+        Returns:
+            The page of users, the cursor for the next page and the cursor for the
+            previous page (either is None when there is no such page).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        key = tuple_(User.created_at, User.id)
+        direction = NEXT
+        query = select(User).where(*criteria)
+        if projection:
+            query = query.options(cls._response_projection())
+        if cursor:
+            created_at, user_id, direction = decode_cursor(cursor)
+            position = tuple_(created_at, user_id)
+            query = query.where(key > position) if direction == NEXT else query.where(key < position)
+
+        if direction == NEXT:
+            query = query.order_by(User.created_at, User.id)
+        else:
+            query = query.order_by(User.created_at.desc(), User.id.desc())
+
+        result = await cls._execute_query(session, query.limit(limit + 1))
+        users = list(result.scalars().all()) if result else []
+        has_more = len(users) > limit
+        users = users[:limit]
+        if direction == PREV:
+            users.reverse()
+        if not users:
+            return [], None, None
+
+        first, last = users[0], users[-1]
+        if direction == NEXT:
+            next_cursor = encode_cursor(last.created_at, last.id, NEXT) if has_more else None
+            prev_cursor = encode_cursor(first.created_at, first.id, PREV) if cursor else None
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id, NEXT)
+            prev_cursor = encode_cursor(first.created_at, first.id, PREV) if has_more else None
+        return users, next_cursor, prev_cursor
+
+    @staticmethod
+    def search_criteria(
+        q: Optional[str] = None,
+        role: Optional[UserRole] = None,
+        email_verified: Optional[bool] = None,
+        is_locked: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> list:
+        """
+        Build WHERE clauses for a user search.
+
+        `q` matches a case-insensitive fragment of nickname or email (served by the
+        trigram indexes); the remaining filters use the btree indexes.
+        """
+        criteria = []
+        if q:
+            escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            criteria.append(or_(User.nickname.ilike(pattern, escape="\\"), User.email.ilike(pattern, escape="\\")))
+        if role is not None:
+            criteria.append(User.role == role)
+        if email_verified is not None:
+            criteria.append(User.email_verified == email_verified)
+        if is_locked is not None:
+            criteria.append(User.is_locked == is_locked)
+        if created_from is not None:
+            criteria.append(User.created_at >= created_from)
+        if created_to is not None:
+            criteria.append(User.created_at < created_to)
+        return criteria
+
+    @classmethod
+    async def search(
+        cls, session: AsyncSession, limit: int = 10, cursor: Optional[str] = None, **filters
+    ) -> Tuple[List[User], Optional[str], Optional[str]]:
+        """
+        Search users by nickname/email fragment, role, verification, lock status and
+        creation range, newest-last with keyset pagination.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        criteria = cls.search_criteria(**filters)
+        return await cls.list_users_keyset(session, limit, cursor, projection=True, criteria=criteria)
+
     @classmethod
     async def register_user(cls, session: AsyncSession, user_data: dict, email_service: EmailService) -> Optional[User]:
         if isinstance(user_data, dict):
             user_data = UserCreate(**user_data)
 
-        user = await cls.create(session, user_data, email_service)
-
-        if user and not user.email_verified:
-            await email_service.send_verification_email(user)
+        # The user row and its verification email are committed together; the
+        # outbox relay delivers the email, retrying if the SMTP server is down.
+        try:
+            user = await cls._insert_user(session, user_data)
+        except ValidationError as e:
+            logger.error(f"Validation error during user creation: {e}")
+            return None
+        if user:
+            if not user.email_verified:
+                enqueue_email(session, EmailService.verification_email_data(user), 'email_verification')
+            await session.commit()
+            cls.invalidate_count_cache()
         return user
 
+    @classmethod
+    async def authenticate(cls, session: AsyncSession, email: str, password: str) -> Tuple[Optional[User], bool]:
+        """
+        Check credentials with one lookup and record the outcome with one conditional UPDATE.
+
+        Returns `(user, locked)`: the user on success, and whether the account is locked.
+        A failed attempt increments `failed_login_attempts` in SQL and locks the account in
+        the same statement once the limit is reached, so concurrent attempts cannot lose
+        counts. A success resets the counter only if the account was not locked meanwhile,
+        and rehashes the password in the same UPDATE if its hash is outdated.
+        """
+        user, locked, attempted_id = await cls._record_login_attempt(session, email, password)
+        if attempted_id is not None:
+            await session.commit()
+            invalidate_user(attempted_id)
+        return user, locked
+
+    @classmethod
+    async def login(cls, session: AsyncSession, email: str, password: str) -> Tuple[Optional[User], bool, Optional[str]]:
+        """
+        `authenticate` plus a new refresh token family, committed together.
+
+        Returns `(user, locked, refresh_token)`; the token is None unless the login succeeded.
+        """
+        user, locked, attempted_id = await cls._record_login_attempt(session, email, password)
+        refresh_token = await RefreshTokenService.issue(session, user) if user else None
+        if attempted_id is not None:
+            await session.commit()
+            invalidate_user(attempted_id)
+        return user, locked, refresh_token
+
+    @classmethod
+    async def _record_login_attempt(cls, session: AsyncSession, email: str, password: str) -> Tuple[Optional[User], bool, Optional[UUID]]:
+        """Check credentials and stage the counter UPDATE without committing; the id is set if a row was updated."""
+        user = await cls._fetch_user(session, undefer(User.hashed_password), email=email)
+        if not user:
+            return None, False, None
+        if user.is_locked:
+            return None, True, None
+        if not user.email_verified:
+            return None, False, None
+
+        password_ok = await verify_password_async(password, user.hashed_password)
+        if password_ok:
+            values = {'failed_login_attempts': 0, 'last_login_at': datetime.now(timezone.utc)}
+            if password_needs_rehash(user.hashed_password):
+                # Upgrade legacy hashes (other scheme or costs) while we hold the plain password.
+                values['hashed_password'] = await hash_password_async(password)
+            query = (
+                update(User)
+                .where(User.id == user.id, User.is_locked.is_(False))
+                .values(**values)
+            )
+        else:
+            attempts = User.failed_login_attempts + 1
+            query = (
+                update(User)
+                .where(User.id == user.id)
+                .values(
+                    failed_login_attempts=attempts,
+                    is_locked=case((attempts >= settings.max_login_attempts, True), else_=User.is_locked),
+                )
+            )
+        result = await session.execute(
+            query.returning(User).execution_options(synchronize_session=False, populate_existing=True)
+        )
+        updated_user = result.scalars().first()
+
+        if not password_ok:
+            return None, False, user.id
+        if updated_user is None:
+            # Locked by a concurrent failed attempt between the lookup and the reset.
+            return None, True, user.id
+        return updated_user, False, user.id
+
     @classmethod
     async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[User]:
-        user = await cls.get_by_email(session, email)
-        if user:
-            if not user.email_verified or user.is_locked:
-                return None
-            if verify_password(password, user.hashed_password):
-                user.failed_login_attempts = 0
-                user.last_login_at = datetime.now(timezone.utc)
-                session.add(user)
-                await session.commit()
-                return user
-            else:
-                user.failed_login_attempts += 1
-                if user.failed_login_attempts >= settings.max_login_attempts:
-                    user.is_locked = True
-                session.add(user)
-                await session.commit()
-        return None
+        user, _ = await cls.authenticate(session, email, password)
+        return user
 
     @classmethod
     async def is_account_locked(cls, session: AsyncSession, email: str) -> bool:
@@ -166,26 +457,30 @@ class UserService:
 
     @classmethod
     async def reset_password(cls, session: AsyncSession, user_id: UUID, new_password: str) -> bool:
-        hashed_password = hash_password(new_password)
+        hashed_password = await hash_password_async(new_password)
         user = await cls.get_by_id(session, user_id)
         if user:
             user.hashed_password = hashed_password
             user.failed_login_attempts = 0
             user.is_locked = False
+            user.token_version = User.token_version + 1
             session.add(user)
             await session.commit()
+            invalidate_user(user.id)
             return True
         return False
 
     @classmethod
     async def verify_email_with_token(cls, session: AsyncSession, user_id: UUID, token: str) -> bool:
-        user = await cls.get_by_id(session, user_id)
+        user = await cls._fetch_user(session, undefer(User.verification_token), id=user_id)
         if user and user.verification_token == token:
             user.email_verified = True
             user.verification_token = None
             user.role = UserRole.AUTHENTICATED
+            user.token_version = User.token_version + 1
             session.add(user)
             await session.commit()
+            invalidate_user(user.id)
             return True
         return False
 
@@ -195,6 +490,71 @@ class UserService:
         result = await session.execute(query)
         return result.scalar()
 
+    @classmethod
+    async def count_rows(cls, session: AsyncSession, model, *criteria, strategy: Optional[str] = None) -> Tuple[int, bool]:
+        """
+        Count rows of `model` matching `criteria` for a list endpoint's total.
+
+        Strategies:
+            exact: `SELECT count(*)` every time.
+            cached: exact count kept for `count_cache_ttl_seconds`, dropped on create/delete.
+            estimated: planner row estimate from pg_class for unfiltered counts; falls
+                back to `cached` when filtered, on small tables or on other databases.
+
+        Returns:
+            The total and whether it may be approximate.
+        """
+        strategy = strategy or settings.count_strategy
+        query = select(func.count()).select_from(model)
+        if criteria:
+            query = query.where(*criteria)
+
+        if strategy == cls.COUNT_ESTIMATED and not criteria:
+            estimate = await cls._estimate_rows(session, model.__tablename__)
+            if estimate is not None and estimate >= settings.count_estimate_threshold:
+                return estimate, True
+        if strategy in (cls.COUNT_CACHED, cls.COUNT_ESTIMATED):
+            return await cls._cached_count(session, model.__tablename__, query)
+
+        result = await session.execute(query)
+        return result.scalar(), False
+
+    @classmethod
+    async def _cached_count(cls, session: AsyncSession, table_name: str, query) -> Tuple[int, bool]:
+        params = query.compile().params
+        key = f"{query}|{sorted(params.items(), key=lambda item: item[0])!r}"
+        # Bounded: search filters are caller-controlled, so every distinct combination is a new key
+        table_cache = cls._count_cache.get(table_name)
+        if table_cache is None:
+            table_cache = cls._count_cache.setdefault(
+                table_name, TTLCache(settings.count_cache_size, settings.count_cache_ttl_seconds)
+            )
+        cached = table_cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        result = await session.execute(query)
+        total = result.scalar()
+        table_cache.put(key, total)
+        return total, False
+
+    @classmethod
+    async def _estimate_rows(cls, session: AsyncSession, table_name: str) -> Optional[int]:
+        """Planner estimate of the table's row count, or None when unavailable."""
+        if session.get_bind().dialect.name != "postgresql":
+            return None
+        result = await session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": table_name},
+        )
+        estimate = result.scalar()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    @classmethod
+    def invalidate_count_cache(cls, table_name: str = User.__tablename__):
+        cls._count_cache.pop(table_name, None)
+
     @classmethod
     async def unlock_user_account(cls, session: AsyncSession, user_id: UUID) -> bool:
         user = await cls.get_by_id(session, user_id)
@@ -203,5 +563,6 @@ class UserService:
             user.failed_login_attempts = 0
             session.add(user)
             await session.commit()
+            invalidate_user(user.id)
             return True
         return False
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RouteLimiter:
+    """
+    Concurrency limit for one route: at most `limit` requests run at once and at most
+    `max_queue` wait for a slot, each for no longer than `queue_timeout` seconds.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in line if there is room; False means shed the request."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        acquired = False
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            acquired = True
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if not acquired:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done():
+                    # The slot was handed over just as we gave up (or were cancelled); pass it on.
+                    self.release()
+        if not acquired:
+            self.rejected += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def release(self):
+        # Hand the slot straight to the next waiter so newcomers cannot jump the queue.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionController:
+    """Per-route limiters keyed by "METHOD /path"; routes without a limit are never held back."""
+
+    def __init__(self, limits: Dict[str, int], max_queue: int, queue_timeout: float,
+                 retry_after_seconds: int = 1, reject_status: int = 503):
+        self.retry_after_seconds = retry_after_seconds
+        self.reject_status = reject_status
+        self.limiters = {
+            route: RouteLimiter(limit, max_queue, queue_timeout) for route, limit in limits.items()
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> "AdmissionController":
+        limits = settings.admission_limits if settings.admission_control_enabled else {}
+        return cls(
+            limits,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout_seconds,
+            retry_after_seconds=settings.admission_retry_after_seconds,
+            reject_status=settings.admission_reject_status,
+        )
+
+    def limiter_for(self, method: str, path: str) -> Optional[RouteLimiter]:
+        return self.limiters.get(f"{method} {path}")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {route: limiter.stats() for route, limiter in self.limiters.items()}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that sheds load on expensive routes before they reach the app.
+
+    Requests over a route's limit wait briefly in a bounded queue; when the queue is
+    full or the wait times out they get an immediate 503 (or the configured status)
+    with `Retry-After`, so floods on e.g. `/login/` cannot starve cheap endpoints
+    of event loop time, hashing workers or pool connections.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limiter = self.controller.limiter_for(scope["method"], scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        if not await limiter.acquire():
+            logger.warning(f"Shedding {scope['method']} {scope['path']}: {limiter.stats()}")
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": "Server is busy, please retry later."}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": self.controller.reject_status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(self.controller.retry_after_seconds).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,30 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+NEXT = "next"
+PREV = "prev"
+
+def encode_cursor(created_at: datetime, user_id: UUID, direction: str = NEXT) -> str:
+    """Encode a `(created_at, id)` keyset position as an opaque URL-safe cursor."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(user_id), "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID, str]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        direction = payload["d"]
+        if direction not in (NEXT, PREV):
+            raise ValueError(f"Unknown cursor direction: {direction}")
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"]), direction
+    except (KeyError, TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -1,6 +1,6 @@
 from builtins import dict, int, max, str
-from typing import List, Callable
-from urllib.parse import urlencode
+from typing import List, Callable, Optional
+from urllib.parse import parse_qsl, urlencode
 from uuid import UUID
 
 from fastapi import Request
@@ -16,6 +16,12 @@ def create_pagination_link(rel: str, base_url: str, params: dict) -> PaginationL
     query_string = f"skip={params['skip']}&limit={params['limit']}"
     return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
 
+def create_cursor_pagination_link(rel: str, base_url: str, cursor: Optional[str], limit: int, extra_params: list = ()) -> PaginationLink:
+    # No cursor links to the first page
+    cursor_params = [('cursor', cursor)] if cursor else []
+    query_string = urlencode([*extra_params, *cursor_params, ('limit', limit)])
+    return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
+
 def create_user_links(user_id: UUID, request: Request) -> List[Link]:
     """
     Generate navigation links for user actions.
@@ -30,8 +36,33 @@ def create_user_links(user_id: UUID, request: Request) -> List[Link]:
         for rel, action, method, action_desc in actions
     ]
 
-def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
-    base_url = str(request.url)
+def generate_pagination_links(
+    request: Request,
+    skip: Optional[int],
+    limit: int,
+    total_items: int,
+    next_cursor: Optional[str] = None,
+    prev_cursor: Optional[str] = None,
+) -> List[PaginationLink]:
+    """
+    Build self/first/last/next/prev links.
+
+    Pass `skip=None` with `next_cursor`/`prev_cursor` for keyset (cursor) pages;
+    next/prev then carry the cursor and no `last` link is emitted.
+    """
+    base_url, _, query = str(request.url).partition("?")
+    links = []
+    if skip is None:
+        # Keep filters (e.g. search parameters) on cursor links
+        extra_params = [(k, v) for k, v in parse_qsl(query) if k not in ('skip', 'limit', 'cursor')]
+        links.append(PaginationLink(rel="self", href=str(request.url)))
+        links.append(create_cursor_pagination_link("first", base_url, None, limit, extra_params))
+        if next_cursor:
+            links.append(create_cursor_pagination_link("next", base_url, next_cursor, limit, extra_params))
+        if prev_cursor:
+            links.append(create_cursor_pagination_link("prev", base_url, prev_cursor, limit, extra_params))
+        return links
+
     total_pages = (total_items + limit - 1) // limit
     links = [
         create_pagination_link("self", base_url, {'skip': skip, 'limit': limit}),
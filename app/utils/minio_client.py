@@ -10,8 +10,14 @@ minio_client = Minio(
     secure=False
 )
 
-def upload_qr(buffer: BytesIO) -> str:
-    filename = f"{uuid.uuid4()}.png"
+def new_qr_object_name() -> str:
+    return f"{uuid.uuid4()}.png"
+
+def qr_object_url(filename: str) -> str:
+    return f"http://{settings.minio_endpoint}/{settings.minio_bucket}/{filename}"
+
+def upload_qr(buffer: BytesIO, filename: str = None) -> str:
+    filename = filename or new_qr_object_name()
     minio_client.put_object(
         settings.minio_bucket,
         filename,
@@ -19,4 +25,4 @@ def upload_qr(buffer: BytesIO) -> str:
         length=buffer.getbuffer().nbytes,
         content_type="image/png"
     )
-    return f"http://{settings.minio_endpoint}/{settings.minio_bucket}/{filename}"
+    return qr_object_url(filename)
@@ -1,10 +1,46 @@
 from builtins import str
 import random
+from typing import Set
+
+ADJECTIVES = (
+    "agile", "amber", "ancient", "arctic", "azure", "bold", "brave", "breezy", "bright", "brisk",
+    "calm", "candid", "cheery", "clever", "cosmic", "crimson", "curious", "daring", "dapper", "dazzling",
+    "deft", "eager", "earnest", "electric", "emerald", "epic", "fabled", "fearless", "fiery", "fluffy",
+    "frosty", "gentle", "gifted", "gleaming", "golden", "graceful", "grand", "happy", "hardy", "hidden",
+    "humble", "icy", "idle", "indigo", "jade", "jolly", "jovial", "keen", "kind", "lively",
+    "loyal", "lucky", "lunar", "magic", "mellow", "merry", "mighty", "misty", "modest", "mossy",
+    "nimble", "noble", "nova", "oaken", "olive", "onyx", "opal", "patient", "plucky", "polar",
+    "proud", "quick", "quiet", "quirky", "radiant", "rapid", "rustic", "sage", "scarlet", "serene",
+    "shiny", "silent", "silver", "sleek", "sly", "snowy", "solar", "spry", "stellar", "stormy",
+    "sunny", "swift", "tidy", "tranquil", "trusty", "velvet", "vivid", "wandering", "witty", "zesty",
+)
+
+ANIMALS = (
+    "albatross", "alpaca", "antelope", "armadillo", "badger", "bat", "bear", "beaver", "bison", "bobcat",
+    "buffalo", "camel", "caribou", "cat", "cheetah", "chinchilla", "cobra", "condor", "cougar", "coyote",
+    "crane", "crow", "deer", "dingo", "dolphin", "donkey", "dove", "eagle", "eel", "elephant",
+    "elk", "falcon", "ferret", "finch", "flamingo", "fox", "gazelle", "gecko", "gibbon", "giraffe",
+    "goat", "gorilla", "grouse", "hamster", "hare", "hawk", "hedgehog", "heron", "hippo", "hornet",
+    "hyena", "ibex", "ibis", "iguana", "impala", "jackal", "jaguar", "jay", "kangaroo", "kestrel",
+    "kiwi", "koala", "lemur", "leopard", "lion", "llama", "lynx", "magpie", "marmot", "meerkat",
+    "mink", "mole", "moose", "newt", "ocelot", "octopus", "orca", "osprey", "otter", "owl",
+    "panda", "panther", "parrot", "pelican", "penguin", "puffin", "puma", "quail", "rabbit", "raccoon",
+    "raven", "seal", "shark", "sloth", "sparrow", "swan", "tiger", "turtle", "walrus", "wolf",
+)
+
+# 100 adjectives x 100 animals x 10,000 numbers = 100,000,000 nicknames
+NUMBER_SPACE = 10000
 
 
 def generate_nickname() -> str:
     """Generate a URL-safe nickname using adjectives and animal names."""
-    adjectives = ["clever", "jolly", "brave", "sly", "gentle"]
-    animals = ["panda", "fox", "raccoon", "koala", "lion"]
-    number = random.randint(0, 999)
-    return f"{random.choice(adjectives)}_{random.choice(animals)}_{number}"
+    number = random.randrange(NUMBER_SPACE)
+    return f"{random.choice(ADJECTIVES)}_{random.choice(ANIMALS)}_{number}"
+
+
+def generate_nicknames(count: int) -> Set[str]:
+    """Generate `count` distinct candidate nicknames, e.g. to check for free ones in one query."""
+    candidates = set()
+    while len(candidates) < count:
+        candidates.add(generate_nickname())
+    return candidates
@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Paces callers to at most `rate_per_second` acquisitions per second on one event loop.
+
+    Each `acquire` reserves the next send slot before sleeping, so concurrent workers
+    share one schedule. Up to `burst` acquisitions may run back to back after an idle
+    period. A rate of 0 (or less) disables limiting.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self._interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        if self._interval == 0.0:
+            return
+        now = time.monotonic()
+        # Unused slots from an idle period only carry over up to the burst size
+        slot = max(self._next_slot, now - (self.burst - 1) * self._interval)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
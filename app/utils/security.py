@@ -1,19 +1,98 @@
 # app/security.py
 from builtins import Exception, ValueError, bool, int, str
+import asyncio
 import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 import bcrypt
+from argon2 import PasswordHasher as Argon2PasswordHasher, Type as Argon2Type
+from argon2.exceptions import VerifyMismatchError
 from logging import getLogger
 
+from settings.config import settings
+
 # Set up logging
 logger = getLogger(__name__)
 
-def hash_password(password: str, rounds: int = 12) -> str:
+class BcryptHasher:
+    """bcrypt with a configurable cost factor (`$2b$` hashes)."""
+
+    scheme = "bcrypt"
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def identifies(self, hashed_password: str) -> bool:
+        return hashed_password.startswith("$2")
+
+    def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def needs_update(self, hashed_password: str) -> bool:
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+class Argon2Hasher:
+    """argon2id with configurable time cost, memory cost (KiB) and parallelism (`$argon2id$` hashes)."""
+
+    scheme = "argon2"
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+        self._hasher = Argon2PasswordHasher(
+            time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism, type=Argon2Type.ID,
+        )
+
+    def identifies(self, hashed_password: str) -> bool:
+        return hashed_password.startswith("$argon2")
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        try:
+            return self._hasher.verify(hashed_password, plain_password)
+        except VerifyMismatchError:
+            return False
+
+    def needs_update(self, hashed_password: str) -> bool:
+        return self._hasher.check_needs_rehash(hashed_password)
+
+
+def get_password_hasher(scheme: Optional[str] = None):
+    """Hasher for `scheme`, or for the configured `password_hash_scheme`, with the configured costs."""
+    scheme = scheme or settings.password_hash_scheme
+    if scheme == BcryptHasher.scheme:
+        return BcryptHasher(settings.bcrypt_rounds)
+    if scheme == Argon2Hasher.scheme:
+        return Argon2Hasher(settings.argon2_time_cost, settings.argon2_memory_cost, settings.argon2_parallelism)
+    raise ValueError(f"Unknown password hash scheme: {scheme}")
+
+def _hasher_for(hashed_password: str):
+    """Hasher able to verify an existing hash, whatever scheme it was created with."""
+    for scheme in (Argon2Hasher.scheme, BcryptHasher.scheme):
+        hasher = get_password_hasher(scheme)
+        if hasher.identifies(hashed_password):
+            return hasher
+    return get_password_hasher(BcryptHasher.scheme)
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
-    Hashes a password using bcrypt with a specified cost factor.
-    
+    Hashes a password with the configured scheme (`password_hash_scheme`).
+
     Args:
         password (str): The plain text password to hash.
-        rounds (int): The cost factor that determines the computational cost of hashing.
+        rounds (int): Optional bcrypt cost factor; when given, hashes with bcrypt at that cost.
 
     Returns:
         str: The hashed password.
@@ -22,9 +101,8 @@ def hash_password(password: str, rounds: int = 12) -> str:
         ValueError: If hashing the password fails.
     """
     try:
-        salt = bcrypt.gensalt(rounds=rounds)
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed_password.decode('utf-8')
+        hasher = BcryptHasher(rounds) if rounds is not None else get_password_hasher()
+        return hasher.hash(password)
     except Exception as e:
         logger.error("Failed to hash password: %s", e)
         raise ValueError("Failed to hash password") from e
@@ -35,7 +113,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     
     Args:
         plain_password (str): The plain text password to verify.
-        hashed_password (str): The bcrypt hashed password.
+        hashed_password (str): A bcrypt or argon2 hashed password.
 
     Returns:
         bool: True if the password is correct, False otherwise.
@@ -44,10 +122,90 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         ValueError: If the hashed password format is incorrect or the function fails to verify.
     """
     try:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return _hasher_for(hashed_password).verify(plain_password, hashed_password)
     except Exception as e:
         logger.error("Error verifying password: %s", e)
         raise ValueError("Authentication process encountered an unexpected error") from e
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if a hash was made with another scheme or other costs than currently configured."""
+    hasher = get_password_hasher()
+    if not hasher.identifies(hashed_password):
+        return True
+    try:
+        return hasher.needs_update(hashed_password)
+    except Exception as e:
+        logger.warning("Could not inspect password hash parameters: %s", e)
+        return True
+
+class HashingPoolFull(RuntimeError):
+    """Raised when too many password hashes are already waiting for a worker."""
+
+
+class HashingPool:
+    """
+    Runs password hashing on a dedicated thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism. At most
+    `max_workers` hashes run at once; up to `max_queue` more wait for a worker, and
+    beyond that `run` raises `HashingPoolFull` instead of growing the backlog.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int = 0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.max_queue and self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HashingPoolFull("Too many password hashing requests in progress")
+            self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "workers": self.max_workers,
+                "running": min(in_flight, self.max_workers),
+                "queued": max(0, in_flight - self.max_workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_hashing_pool: Optional[HashingPool] = None
+_hashing_pool_lock = threading.Lock()
+
+def get_hashing_pool() -> HashingPool:
+    """Return the process-wide hashing pool, creating it from settings on first use."""
+    global _hashing_pool
+    with _hashing_pool_lock:
+        if _hashing_pool is None:
+            _hashing_pool = HashingPool(settings.password_hash_workers, settings.password_hash_max_queue)
+        return _hashing_pool
+
+async def hash_password_async(password: str, rounds: Optional[int] = None) -> str:
+    """`hash_password` on the hashing pool; use this from request handlers."""
+    return await get_hashing_pool().run(hash_password, password, rounds)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` on the hashing pool; use this from request handlers."""
+    return await get_hashing_pool().run(verify_password, plain_password, hashed_password)
+
 def generate_verification_token():
     return secrets.token_urlsafe(16)  # Generates a secure 16-byte URL-safe token
\ No newline at end of file
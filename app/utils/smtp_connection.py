@@ -1,33 +1,280 @@
 # smtp_client.py
 from builtins import Exception, int, str
+import asyncio
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Dict, List, Optional, Tuple
 from settings.config import settings
 import logging
 
+# Errors that mean the connection itself is unusable, so it is dropped and, if DATA was not
+# sent yet, the send retried once. (SMTPException subclasses OSError, so other SMTP errors
+# must be caught before OSError.)
+DISCONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+
+class SMTPPoolClosed(RuntimeError):
+    """Raised when a connection is requested from a pool that has been closed."""
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of authenticated SMTP connections.
+
+    EHLO, STARTTLS and LOGIN run once per connection instead of once per message.
+    Connections idle for longer than `idle_timeout` are closed (on checkout and by a
+    background reaper), and a connection that fails mid-send is discarded so the next
+    checkout opens a fresh one. Once closed, the pool refuses checkouts and closes
+    connections returned to it.
+    """
+
+    def __init__(self, server: str, port: int, username: str, password: str, max_size: int = 4,
+                 idle_timeout: float = 60.0, timeout: float = 10.0, use_tls: bool = True):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.use_tls = use_tls
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._open = 0
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._closed = False
+        self._reaper: Optional[threading.Thread] = None
+        self.connects = 0
+        self.reaped = 0
+        self.discarded = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        try:
+            connection.ehlo()                 # 👈 Mandatory before starttls
+            if self.use_tls:
+                connection.starttls()         # 🔐 Upgrade to TLS
+                connection.ehlo()             # 👈 Re-identify after starttls
+            if self.username and self.password:
+                connection.login(self.username, self.password)
+        except Exception:
+            self._close(connection)
+            raise
+        with self._condition:
+            self.connects += 1
+        return connection
+
+    @staticmethod
+    def _close(connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    def _reap_locked(self, now: float) -> List[smtplib.SMTP]:
+        expired = [conn for conn, idle_since in self._idle if now - idle_since >= self.idle_timeout]
+        if expired:
+            self._idle = [(conn, idle_since) for conn, idle_since in self._idle if now - idle_since < self.idle_timeout]
+            self._open -= len(expired)
+            self.reaped += len(expired)
+            self._condition.notify(len(expired))
+        return expired
+
+    def reap_idle(self):
+        """Close connections that have been idle for longer than `idle_timeout`."""
+        with self._condition:
+            expired = self._reap_locked(time.monotonic())
+        for connection in expired:
+            self._close(connection)
+
+    def _run_reaper(self):
+        while not self._stopped.wait(max(1.0, self.idle_timeout / 2)):
+            self.reap_idle()
+
+    def acquire(self) -> smtplib.SMTP:
+        with self._condition:
+            if self._closed:
+                raise SMTPPoolClosed("SMTP connection pool is closed")
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._run_reaper, name="smtp-reaper", daemon=True)
+                self._reaper.start()
+            stale = []
+            deadline = time.monotonic() + self.timeout
+            while True:
+                stale.extend(self._reap_locked(time.monotonic()))
+                if self._idle:
+                    connection = self._idle.pop()[0]
+                    break
+                if self._open < self.max_size:
+                    self._open += 1
+                    connection = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("No SMTP connection became available")
+                self._condition.wait(remaining)
+                if self._closed:
+                    raise SMTPPoolClosed("SMTP connection pool is closed")
+        for expired in stale:
+            self._close(expired)
+        if connection is not None:
+            return connection
+        try:
+            return self._connect()
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection: smtplib.SMTP, broken: bool = False):
+        if broken or self._closed:
+            self._close(connection)
+            with self._condition:
+                self._open -= 1
+                self.discarded += 1
+                self._condition.notify()
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def close(self):
+        """Close idle connections and stop the reaper; connections still in use are closed on release."""
+        self._stopped.set()
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                "open": self._open,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                "connects": self.connects,
+                "reaped": self.reaped,
+                "discarded": self.discarded,
+            }
+
+
 class SMTPClient:
-    def __init__(self, server: str, port: int, username: str, password: str):
+    def __init__(self, server: str, port: int, username: str, password: str, pool_size: int = 4,
+                 idle_timeout: float = 60.0, timeout: float = 10.0, use_tls: bool = True):
         self.server = server
         self.port = port
         self.username = username
         self.password = password
+        self.pool = SMTPConnectionPool(
+            server, port, username, password,
+            max_size=pool_size, idle_timeout=idle_timeout, timeout=timeout, use_tls=use_tls,
+        )
+        # One thread per pooled connection: sends never run on the event loop.
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="smtp-send")
+
+    def _build_message(self, subject: str, html_content: str, recipient: str) -> str:
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = self.username
+        message['To'] = recipient
+        message.attach(MIMEText(html_content, 'html'))
+        return message.as_string()
 
     def send_email(self, subject: str, html_content: str, recipient: str):
+        """
+        Send one message over a pooled connection (blocking).
+
+        A dropped connection is retried once on a fresh one, but only if it failed
+        before DATA was sent; after that the message may already have been delivered.
+        """
         try:
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = self.username
-            message['To'] = recipient
-            message.attach(MIMEText(html_content, 'html'))
-
-            with smtplib.SMTP(self.server, self.port) as server:
-                server.ehlo()                 # 👈 Mandatory before starttls
-                server.starttls()            # 🔐 Upgrade to TLS
-                server.ehlo()                 # 👈 Re-identify after starttls
-                server.login(self.username, self.password)
-                server.sendmail(self.username, recipient, message.as_string())
+            message = self._build_message(subject, html_content, recipient)
+            for attempt in range(2):
+                connection = self.pool.acquire()
+                data_sent = False
+                try:
+                    # sendmail() in its three steps, so a failure can be placed before or after DATA.
+                    code, response = connection.mail(self.username)
+                    if code != 250:
+                        raise smtplib.SMTPSenderRefused(code, response, self.username)
+                    code, response = connection.rcpt(recipient)
+                    if code not in (250, 251):
+                        raise smtplib.SMTPRecipientsRefused({recipient: (code, response)})
+                    data_sent = True
+                    connection.data(message)
+                except DISCONNECT_ERRORS:
+                    self.pool.release(connection, broken=True)
+                    if attempt or data_sent:
+                        raise
+                    continue
+                except smtplib.SMTPException:
+                    # Rejected message: the connection may be mid-transaction, so reset it.
+                    try:
+                        connection.rset()
+                        self.pool.release(connection)
+                    except Exception:
+                        self.pool.release(connection, broken=True)
+                    raise
+                except OSError:
+                    self.pool.release(connection, broken=True)
+                    if attempt or data_sent:
+                        raise
+                    continue
+                self.pool.release(connection)
+                break
             logging.info(f"✅ Email sent to {recipient}")
         except Exception as e:
             logging.error(f"❌ Failed to send email: {str(e)}")
             raise
+
+    async def send_email_async(self, subject: str, html_content: str, recipient: str):
+        """`send_email` on the client's sender threads, so the event loop keeps serving requests."""
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.send_email, subject, html_content, recipient
+        )
+
+    def close(self):
+        """
+        Finish queued sends, then close the pool; the client refuses sends afterwards.
+
+        Blocks until the queued sends are done, so async callers should run it in a thread.
+        """
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+
+_smtp_client: Optional[SMTPClient] = None
+_smtp_client_lock = threading.Lock()
+
+def get_smtp_client() -> SMTPClient:
+    """Process-wide SMTP client, so every EmailService shares one connection pool."""
+    global _smtp_client
+    with _smtp_client_lock:
+        if _smtp_client is None:
+            _smtp_client = SMTPClient(
+                server=settings.smtp_server,
+                port=settings.smtp_port,
+                username=settings.smtp_username,
+                password=settings.smtp_password,
+                pool_size=settings.smtp_pool_size,
+                idle_timeout=settings.smtp_idle_timeout_seconds,
+                timeout=settings.smtp_timeout_seconds,
+                use_tls=settings.smtp_use_tls,
+            )
+        return _smtp_client
+
+def close_smtp_client():
+    """Close the shared client (e.g. on shutdown); the next `get_smtp_client()` creates a new one."""
+    global _smtp_client
+    with _smtp_client_lock:
+        client, _smtp_client = _smtp_client, None
+    if client is not None:
+        client.close()
@@ -1,11 +1,53 @@
-import markdown2
+import html
+import threading
+import uuid
 from pathlib import Path
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
+
+import markdown2
+
+_formatter = Formatter()
+
+
+class CompiledTemplate:
+    """
+    An email template already converted to styled HTML.
+
+    The HTML is stored as alternating literal chunks and placeholders, so rendering
+    is a single join of the literals with the (HTML-escaped) context values.
+    """
+
+    def __init__(self, parts: List[str], fields: List[Tuple[str, str, Optional[str]]], mtimes: Dict[Path, float]):
+        self.parts = parts          # len(fields) + 1 literal HTML chunks
+        self.fields = fields        # (field_name, format_spec, conversion) between the chunks
+        self.mtimes = mtimes        # source files and the mtimes they were compiled from
+
+    def render(self, **context) -> str:
+        out = [self.parts[0]]
+        for (field_name, format_spec, conversion), literal in zip(self.fields, self.parts[1:]):
+            value, _ = _formatter.get_field(field_name, (), context)
+            value = _formatter.format_field(_formatter.convert_field(value, conversion), format_spec)
+            out.append(html.escape(value))
+            out.append(literal)
+        return "".join(out)
+
 
 class TemplateManager:
+    """
+    Renders markdown email templates.
+
+    Each template (with the shared header and footer) is compiled once to HTML with
+    styles inlined, then recompiled only when one of its files' mtime changes.
+    """
+
     def __init__(self):
         # Dynamically determine the root path of the project
         self.root_dir = Path(__file__).resolve().parent.parent.parent  # Adjust this depending on the structure
         self.templates_dir = self.root_dir / 'email_templates'
+        self._compiled: Dict[str, CompiledTemplate] = {}
+        self._lock = threading.Lock()
+        self.compiles = 0
 
     def _read_template(self, filename: str) -> str:
         """Private method to read template content."""
@@ -32,15 +74,65 @@ class TemplateManager:
                 styled_html = styled_html.replace(f'<{tag}>', f'<{tag} style="{style}">')
         return styled_html
 
-    def render_template(self, template_name: str, **context) -> str:
-        """Render a markdown template with given context, applying advanced email styles."""
+    def _source_files(self, template_name: str) -> List[Path]:
+        return [self.templates_dir / name for name in ('header.md', f'{template_name}.md', 'footer.md')]
+
+    def _compile(self, template_name: str, mtimes: Dict[Path, float]) -> CompiledTemplate:
         header = self._read_template('header.md')
         footer = self._read_template('footer.md')
-
-        # Read main template and format it with provided context
         main_template = self._read_template(f'{template_name}.md')
-        main_content = main_template.format(**context)
+
+        # Swap each {placeholder} for an inert marker that markdown leaves untouched,
+        # render and style the document once, then split the HTML at the markers.
+        nonce = uuid.uuid4().hex
+        fields = []
+        marked = []
+        for literal, field_name, format_spec, conversion in _formatter.parse(main_template):
+            marked.append(literal)
+            if field_name is not None:
+                marked.append(f"tpl{nonce}x{len(fields)}x")
+                fields.append((field_name, format_spec, conversion))
+        main_content = "".join(marked)
 
         full_markdown = f"{header}\n{main_content}\n{footer}"
-        html_content = markdown2.markdown(full_markdown)
-        return self._apply_email_styles(html_content)
+        styled = self._apply_email_styles(markdown2.markdown(full_markdown))
+
+        parts = []
+        for index in range(len(fields)):
+            marker = f"tpl{nonce}x{index}x"
+            if styled.count(marker) != 1:
+                raise ValueError(f"Placeholder {fields[index][0]!r} in {template_name}.md did not survive markdown rendering")
+            literal, styled = styled.split(marker)
+            parts.append(literal)
+        parts.append(styled)
+        self.compiles += 1
+        return CompiledTemplate(parts, fields, mtimes)
+
+    def get_compiled(self, template_name: str) -> CompiledTemplate:
+        """The compiled template, recompiled if any of its source files changed on disk."""
+        mtimes = {path: path.stat().st_mtime for path in self._source_files(template_name)}
+        compiled = self._compiled.get(template_name)
+        if compiled is not None and compiled.mtimes == mtimes:
+            return compiled
+        with self._lock:
+            compiled = self._compiled.get(template_name)
+            if compiled is None or compiled.mtimes != mtimes:
+                compiled = self._compile(template_name, mtimes)
+                self._compiled[template_name] = compiled
+            return compiled
+
+    def render_template(self, template_name: str, **context) -> str:
+        """Render a markdown template with given context, applying advanced email styles."""
+        return self.get_compiled(template_name).render(**context)
+
+
+_template_manager: Optional[TemplateManager] = None
+_template_manager_lock = threading.Lock()
+
+def get_template_manager() -> TemplateManager:
+    """Process-wide TemplateManager, so compiled templates are shared by every EmailService."""
+    global _template_manager
+    with _template_manager_lock:
+        if _template_manager is None:
+            _template_manager = TemplateManager()
+        return _template_manager
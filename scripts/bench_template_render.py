@@ -0,0 +1,42 @@
+"""
+Compare compiling an email template on every send (the old behaviour) with rendering
+from the precompiled cache.
+
+Run from the project root:
+
+    python -m scripts.bench_template_render --iterations 5000
+"""
+import argparse
+import time
+
+from app.utils.template_manager import TemplateManager
+
+CONTEXT = {
+    "name": "Bench User",
+    "verification_url": "http://localhost:8000/verify-email/00000000-0000-0000-0000-000000000000/token",
+    "qr_code_url": "http://localhost:8000/verify-email/00000000-0000-0000-0000-000000000000/token",
+}
+
+
+def rate(render, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    return iterations / (time.perf_counter() - start)
+
+
+def main(iterations: int, template: str):
+    manager = TemplateManager()
+    uncached = rate(lambda: manager._compile(template, {}).render(**CONTEXT), iterations)
+    compiles = manager.compiles
+    cached = rate(lambda: manager.render_template(template, **CONTEXT), iterations)
+    print(f"compile per send:  {uncached:>10.0f} renders/s")
+    print(f"precompiled:       {cached:>10.0f} renders/s  ({cached / uncached:.1f}x, compiles={manager.compiles - compiles})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--template", default="email_verification")
+    args = parser.parse_args()
+    main(args.iterations, args.template)
@@ -0,0 +1,91 @@
+"""
+Pick password hashing costs that hit a target latency on this host.
+
+Run on the deployment host (or one with the same CPU), from the project root:
+
+    python -m scripts.calibrate_password_hash --scheme argon2 --target-ms 250 --memory-budget-mib 256
+
+For argon2id, the memory budget is shared by the `PASSWORD_HASH_WORKERS` hashes that can
+run at once, so each hash gets budget / workers (capped by `--max-memory-mib`). Time cost is
+then raised until one hash takes at least `--target-ms`. For bcrypt, the cost factor is
+raised the same way. The script prints the settings to put in `.env`, together with the
+login throughput they allow, so CPU can be traded for throughput on purpose.
+"""
+import argparse
+import statistics
+import time
+
+from app.utils.security import Argon2Hasher, BcryptHasher
+from settings.config import settings
+
+PASSWORD = "Calibration$Password1"
+
+
+def measure(hasher, samples: int) -> float:
+    """Median milliseconds per hash."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash(PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, samples: int):
+    rounds, elapsed = 4, measure(BcryptHasher(4), samples)
+    while elapsed < target_ms and rounds < 31:
+        rounds += 1
+        elapsed = measure(BcryptHasher(rounds), samples)
+        print(f"  bcrypt rounds={rounds:<2} {elapsed:8.1f} ms")
+    return {"PASSWORD_HASH_SCHEME": "bcrypt", "BCRYPT_ROUNDS": rounds}, elapsed
+
+
+def calibrate_argon2(target_ms: float, memory_kib: int, parallelism: int, samples: int):
+    time_cost = 1
+    elapsed = measure(Argon2Hasher(time_cost, memory_kib, parallelism), samples)
+    print(f"  argon2id t={time_cost:<2} m={memory_kib // 1024}MiB p={parallelism} {elapsed:8.1f} ms")
+    # Memory alone already exceeds the target: shrink it rather than going below t=1.
+    while elapsed > target_ms and memory_kib > 8 * parallelism * 1024:
+        memory_kib //= 2
+        elapsed = measure(Argon2Hasher(time_cost, memory_kib, parallelism), samples)
+        print(f"  argon2id t={time_cost:<2} m={memory_kib // 1024}MiB p={parallelism} {elapsed:8.1f} ms")
+    while elapsed < target_ms:
+        time_cost += 1
+        elapsed = measure(Argon2Hasher(time_cost, memory_kib, parallelism), samples)
+        print(f"  argon2id t={time_cost:<2} m={memory_kib // 1024}MiB p={parallelism} {elapsed:8.1f} ms")
+    return {
+        "PASSWORD_HASH_SCHEME": "argon2",
+        "ARGON2_TIME_COST": time_cost,
+        "ARGON2_MEMORY_COST": memory_kib,
+        "ARGON2_PARALLELISM": parallelism,
+    }, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scheme", choices=["argon2", "bcrypt"], default="argon2")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="desired latency of one hash")
+    parser.add_argument("--workers", type=int, default=settings.password_hash_workers,
+                        help="hashes running at once (PASSWORD_HASH_WORKERS)")
+    parser.add_argument("--memory-budget-mib", type=int, default=256, help="memory for all concurrent argon2 hashes")
+    parser.add_argument("--max-memory-mib", type=int, default=256, help="upper bound for one argon2 hash")
+    parser.add_argument("--parallelism", type=int, default=settings.argon2_parallelism)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Calibrating {args.scheme} for {args.target_ms:.0f} ms per hash with {args.workers} workers")
+    if args.scheme == "bcrypt":
+        env, elapsed = calibrate_bcrypt(args.target_ms, args.samples)
+    else:
+        per_hash_mib = max(8, min(args.max_memory_mib, args.memory_budget_mib // max(1, args.workers)))
+        env, elapsed = calibrate_argon2(args.target_ms, per_hash_mib * 1024, args.parallelism, args.samples)
+
+    print("\nAdd to .env:")
+    for key, value in env.items():
+        print(f"{key}={value}")
+    print(f"\n~{elapsed:.0f} ms per hash -> about {args.workers * 1000 / elapsed:.0f} logins/s with {args.workers} workers")
+    print("Existing hashes are upgraded to these settings on each user's next successful login.")
+
+
+if __name__ == "__main__":
+    main()
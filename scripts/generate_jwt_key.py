@@ -0,0 +1,56 @@
+"""
+Generate a JWT signing key for the key ring in `jwt_keys_dir`.
+
+Run from the project root:
+
+    python -m scripts.generate_jwt_key --alg RS256 --kid 2026-10
+
+Then set JWT_ALGORITHM and JWT_ACTIVE_KID to start signing with it and restart, or, if
+already on an asymmetric algorithm, `POST /keys/reload` with the new kid or send SIGHUP. Keep the previous key file until the tokens it signed have expired,
+optionally replacing it with its public half (`--retire <kid>`) so it can only verify.
+"""
+import argparse
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from settings.config import settings
+
+
+def generate(alg: str):
+    if alg == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alg", choices=["RS256", "EdDSA"], default="RS256")
+    parser.add_argument("--kid", help="key id for the new key")
+    parser.add_argument("--retire", help="kid of a private key to replace with its public half")
+    parser.add_argument("--keys-dir", default=settings.jwt_keys_dir)
+    args = parser.parse_args()
+    keys_dir = Path(args.keys_dir)
+    keys_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.retire:
+        private_path = keys_dir / f"{args.retire}.pem"
+        private_key = serialization.load_pem_private_key(private_path.read_bytes(), password=None)
+        (keys_dir / f"{args.retire}.pub.pem").write_bytes(private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+        ))
+        private_path.unlink()
+        print(f"Retired {args.retire}: only its public key remains")
+
+    if args.kid:
+        path = keys_dir / f"{args.kid}.pem"
+        path.write_bytes(generate(args.alg).private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+        ))
+        path.chmod(0o600)
+        print(f"Wrote {path}\nJWT_ALGORITHM={args.alg}\nJWT_ACTIVE_KID={args.kid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Minimal local SMTP server for tests and benchmarks: accepts everything, records what it receives.
+
+Standalone use (e.g. to point a dev server at it):
+
+    python -m scripts.smtp_sink --port 2525
+"""
+import argparse
+import socketserver
+import threading
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Minimal local SMTP server that accepts everything and records what it receives."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, port: int = 0):
+        super().__init__(("127.0.0.1", port), SMTPSinkHandler)
+        self.messages = []
+        self.connections = 0
+        self.logins = 0
+        self.drop_after_data = False  # hang up instead of acknowledging DATA
+        self.lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self) -> "SMTPSink":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        sink = self.server
+        with sink.lock:
+            sink.connections += 1
+        self.reply("220 sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-sink")
+                self.reply("250 AUTH PLAIN")
+            elif verb == "AUTH":
+                with sink.lock:
+                    sink.logins += 1
+                self.reply("235 authenticated")
+            elif verb == "DATA":
+                self.reply("354 end with .")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    lines.append(data)
+                with sink.lock:
+                    sink.messages.append(b"".join(lines).decode("utf-8"))
+                if sink.drop_after_data:
+                    return
+                self.reply("250 queued")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=2525)
+    args = parser.parse_args()
+    sink = SMTPSink(port=args.port)
+    print(f"SMTP sink listening on 127.0.0.1:{sink.port}")
+    sink.serve_forever()
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict, List
 from pydantic import Field, AnyUrl
 from pydantic_settings import BaseSettings
 
@@ -8,15 +9,29 @@ class Settings(BaseSettings):
     smtp_port: int = Field(default=2525, description="SMTP port")
     smtp_username: str = Field(default='your-mailtrap-username', description="SMTP username")
     smtp_password: str = Field(default='your-mailtrap-password', description="SMTP password")
+    smtp_use_tls: bool = Field(default=True, description="Upgrade SMTP connections with STARTTLS")
+    smtp_pool_size: int = Field(default=4, description="Authenticated SMTP connections kept open for sending")
+    smtp_idle_timeout_seconds: float = Field(default=60.0, description="Close pooled SMTP connections idle this long")
+    smtp_timeout_seconds: float = Field(default=10.0, description="SMTP socket timeout and wait for a free connection")
+    bulk_email_rate_per_second: float = Field(default=10.0, description="Send rate for bulk campaigns (0 = unlimited)")
 
     # ✅ Token / Auth
     access_token_expire_minutes: int = Field(default=15)
     refresh_token_expire_minutes: int = Field(default=1440)
+    refresh_token_purge_interval_seconds: float = Field(default=3600.0, description="Seconds between deletions of expired refresh tokens (0 disables)")
     secret_key: str = Field(default="secret-key")
     algorithm: str = Field(default="HS256")
     jwt_secret_key: str = Field(default="a_very_secret_key")
-    jwt_algorithm: str = Field(default="HS256")
+    jwt_algorithm: str = Field(default="HS256", description="HS256 signs with jwt_secret_key; RS256 or EdDSA sign with keys from jwt_keys_dir")
+    jwt_keys_dir: str = Field(default="keys", description="Directory of <kid>.pem private keys and retired <kid>.pub.pem public keys")
+    jwt_active_kid: str = Field(default="", description="kid of the private key that signs new tokens")
+    jwks_max_age_seconds: int = Field(default=300, description="Cache-Control max-age of /.well-known/jwks.json")
     max_login_attempts: int = Field(default=5)
+    jwt_cache_size: int = Field(default=10000, description="Verified tokens kept in memory until they expire (0 disables)")
+    principal_cache_ttl_seconds: float = Field(default=30.0, description="Lifetime of cached authenticated users (0 disables)")
+    principal_cache_size: int = Field(default=10000, description="Authenticated users kept in memory")
+    auth_mode: str = Field(default="database", description="How require_role authorizes: database (load the user) or claims (signed role + token version)")
+    token_version_cache_ttl_seconds: float = Field(default=5.0, description="Lifetime of cached token versions in claims mode")
 
     # ✅ Server + App Behavior
     server_base_url: AnyUrl = Field(default="http://localhost:8000")
@@ -42,6 +57,65 @@ class Settings(BaseSettings):
     postgres_port: str = Field(default='5432')
     postgres_db: str = Field(default='myappdb')
 
+    # ✅ Connection Pool
+    db_pool_size: int = Field(default=10, description="Connections kept open in the pool")
+    db_max_overflow: int = Field(default=20, description="Extra connections allowed above pool size under load")
+    db_pool_timeout: float = Field(default=10.0, description="Seconds to wait for a free connection before failing")
+    db_pool_recycle: int = Field(default=1800, description="Seconds after which a pooled connection is replaced (-1 disables)")
+    db_pool_pre_ping: bool = Field(default=True, description="Test connections for liveness on checkout")
+    db_statement_cache_size: int = Field(default=100, description="asyncpg prepared statement cache size per connection")
+    db_pgbouncer_mode: bool = Field(default=False, description="Disable prepared statement caching for pgbouncer transaction pooling")
+
+    # ✅ Health Probes
+    health_probes: List[str] = Field(default_factory=lambda: ["database", "smtp", "minio"], description="Dependencies checked in the background")
+    health_ready_probes: List[str] = Field(default_factory=lambda: ["database"], description="Probes that must pass for /health/ready")
+    health_probe_interval_seconds: float = Field(default=15.0, description="Seconds between background probe runs")
+    health_probe_timeout_seconds: float = Field(default=5.0, description="Longest a single probe may take")
+    health_db_warm_connections: int = Field(default=2, description="Pooled DB connections opened and checked by each database probe")
+
+    # ✅ Read Replicas
+    database_read_urls: List[str] = Field(default_factory=list, description="Read replica URLs used by read-only routes")
+    read_your_writes_seconds: float = Field(default=5.0, description="Seconds a client's reads stay on the primary after it writes")
+    trusted_proxies: List[str] = Field(default_factory=list, description="Reverse proxy addresses whose X-Forwarded-For identifies the client")
+
+    # ✅ List Totals
+    count_strategy: str = Field(default="exact", description="How list totals are counted: exact, cached or estimated")
+    count_cache_ttl_seconds: float = Field(default=30.0, description="Lifetime of cached list totals")
+    count_cache_size: int = Field(default=1000, description="Cached list totals kept per table (least recently used evicted)")
+    count_estimate_threshold: int = Field(default=10000, description="Planner estimates below this are replaced by an exact count")
+
+    # ✅ Password Hashing
+    password_hash_scheme: str = Field(default="bcrypt", description="Scheme for new password hashes: bcrypt or argon2 (argon2id)")
+    bcrypt_rounds: int = Field(default=12, description="bcrypt cost factor")
+    argon2_time_cost: int = Field(default=3, description="argon2id iterations")
+    argon2_memory_cost: int = Field(default=65536, description="argon2id memory per hash in KiB")
+    argon2_parallelism: int = Field(default=4, description="argon2id lanes per hash")
+    password_hash_workers: int = Field(default=4, description="Threads that run password hashing off the event loop")
+    password_hash_max_queue: int = Field(default=256, description="Hashes allowed to wait for a worker before new ones are rejected (0 = unbounded)")
+
+    # ✅ Admission Control
+    admission_control_enabled: bool = Field(default=True, description="Shed load on routes listed in admission_limits")
+    admission_limits: Dict[str, int] = Field(
+        default_factory=lambda: {"POST /login/": 16, "POST /register/": 8, "POST /users/": 8, "POST /token/refresh": 32},
+        description='Concurrent requests allowed per "METHOD /path"',
+    )
+    admission_max_queue: int = Field(default=32, description="Requests allowed to wait per limited route before shedding")
+    admission_queue_timeout_seconds: float = Field(default=2.0, description="Longest wait for a slot before shedding")
+    admission_retry_after_seconds: int = Field(default=1, description="Retry-After sent with shed requests")
+    admission_reject_status: int = Field(default=503, description="Status for shed requests (503 or 429)")
+
+    # ✅ Outbox Relay
+    outbox_relay_enabled: bool = Field(default=True, description="Run the outbox relay inside the app process")
+    outbox_batch_size: int = Field(default=20, description="Outbox messages delivered per relay pass")
+    outbox_max_attempts: int = Field(default=8, description="Delivery attempts before a message is marked dead")
+    outbox_backoff_base_seconds: float = Field(default=5.0, description="Delay before the first retry; doubles per attempt")
+    outbox_backoff_max_seconds: float = Field(default=900.0, description="Upper bound on the retry delay")
+    outbox_poll_interval_seconds: float = Field(default=1.0, description="Idle wait between relay passes")
+    outbox_claim_timeout_seconds: float = Field(default=300.0, description="Lease on claimed messages before another relay may retry them")
+    outbox_sent_retention_days: int = Field(default=7, description="Days delivered messages are kept before pruning")
+    outbox_dead_retention_days: int = Field(default=30, description="Days dead messages are kept for inspection before pruning")
+    outbox_prune_interval_seconds: float = Field(default=3600.0, description="Seconds between outbox pruning passes")
+
     # ✅ Optional: External integrations
     discord_bot_token: str = Field(default="NONE")
     discord_channel_id: int = Field(default=1234567890)
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from unittest.mock import AsyncMock
 from uuid import uuid4
@@ -8,15 +9,22 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, scoped_session
 from faker import Faker
 
+# Tests drive the outbox relay explicitly instead of running it in the app's lifespan,
+# and only probe the test database in the background
+os.environ.setdefault("OUTBOX_RELAY_ENABLED", "false")
+os.environ.setdefault("HEALTH_PROBES", '["database"]')
+
 from app.main import app
 from app.database import Base, Database
 from app.models.user_model import User, UserRole
-from app.dependencies import get_db, get_settings
+from app.dependencies import get_db, get_read_db, get_settings
 from app.utils.security import hash_password
 from app.services.email_service import EmailService
 from app.services.jwt_service import create_access_token
+from app.services.principal_cache import clear_all as clear_principal_caches
 from app.services.user_service import UserService
 from app.schemas.user_schemas import UserCreate
+from scripts.smtp_sink import SMTPSink
 
 fake = Faker()
 settings = get_settings()
@@ -40,6 +48,7 @@ def initialize_database():
 
 @pytest.fixture(scope="function", autouse=True)
 async def setup_database():
+    clear_principal_caches()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -58,6 +67,7 @@ async def db_session(setup_database):
 @pytest.fixture(scope="function")
 async def async_client(db_session):
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = lambda: db_session
     async with LifespanManager(app):
         transport = ASGITransport(app=app)
         async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -162,6 +172,13 @@ async def manager_token(manager_user):
 async def user_token(user):
     return create_access_token(data={"sub": str(user.id), "role": user.role.name})
 
+# Local SMTP server that records every message
+@pytest.fixture
+def smtp_sink():
+    sink = SMTPSink().start()
+    yield sink
+    sink.stop()
+
 # Email Mock
 @pytest.fixture
 def email_service():
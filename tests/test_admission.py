@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from app.utils.admission import AdmissionController, AdmissionMiddleware, RouteLimiter
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_app(release: asyncio.Event):
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return app
+
+
+async def call(middleware, method: str, path: str):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware({"type": "http", "method": method, "path": path, "headers": []}, receive, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"])
+
+
+async def test_sheds_requests_over_the_limit():
+    release = asyncio.Event()
+    controller = AdmissionController({"POST /slow": 1}, max_queue=0, queue_timeout=1.0, retry_after_seconds=2)
+    middleware = AdmissionMiddleware(make_app(release), controller)
+
+    first = asyncio.ensure_future(call(middleware, "POST", "/slow"))
+    await asyncio.sleep(0)
+    status, headers = await call(middleware, "POST", "/slow")
+    assert status == 503
+    assert headers[b"retry-after"] == b"2"
+
+    # Routes without a limit are not held back while the limited one is saturated
+    status, _ = await call(middleware, "GET", "/users/1")
+    assert status == 200
+
+    release.set()
+    assert (await first)[0] == 200
+    assert controller.stats()["POST /slow"] == {
+        "limit": 1, "in_flight": 0, "queued": 0, "admitted": 1, "rejected": 1,
+    }
+
+
+async def test_queued_request_runs_when_a_slot_frees():
+    limiter = RouteLimiter(limit=1, max_queue=1, queue_timeout=1.0)
+    assert await limiter.acquire()
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    limiter.release()
+    assert await waiting is True
+    assert limiter.in_flight == 1
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+async def test_queue_wait_times_out():
+    limiter = RouteLimiter(limit=1, max_queue=1, queue_timeout=0.01)
+    assert await limiter.acquire()
+    assert await limiter.acquire() is False
+    assert limiter.queued == 0
+    assert limiter.stats()["rejected"] == 1
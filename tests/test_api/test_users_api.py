@@ -2,6 +2,7 @@ from builtins import str
 import pytest
 from httpx import AsyncClient
 from urllib.parse import urlencode
+from uuid import uuid4
 
 from app.main import app
 from app.models.user_model import UserRole
@@ -48,6 +49,19 @@ async def test_update_user_email_access_allowed(async_client, admin_user, admin_
     assert response.status_code == 200
     assert response.json()["email"] == updated_data["email"]
 
+@pytest.mark.asyncio
+async def test_update_user_duplicate_email(async_client, admin_user, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.put(f"/users/{admin_user.id}", json={"email": verified_user.email}, headers=headers)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "A user with this email or nickname already exists."
+
+@pytest.mark.asyncio
+async def test_update_missing_user(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.put(f"/users/{uuid4()}", json={"first_name": "Nobody"}, headers=headers)
+    assert response.status_code == 404
+
 @pytest.mark.asyncio
 async def test_delete_user(async_client, admin_user, admin_token):
     headers = {"Authorization": f"Bearer {admin_token}"}
@@ -93,6 +107,25 @@ async def test_login_success(async_client, verified_user):
     decoded = decode_token(data["access_token"])
     assert decoded["role"] == "AUTHENTICATED"
 
+@pytest.mark.asyncio
+async def test_refresh_token_rotation(async_client, verified_user):
+    form_data = {
+        "username": verified_user.email,
+        "password": "MySuperPassword$1234"
+    }
+    response = await async_client.post("/login/", data=urlencode(form_data),
+        headers={"Content-Type": "application/x-www-form-urlencoded"})
+    refresh_token = response.json()["refresh_token"]
+
+    response = await async_client.post("/token/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 200
+    data = response.json()
+    assert decode_token(data["access_token"])["sub"] == str(verified_user.id)
+    assert data["refresh_token"] != refresh_token
+
+    response = await async_client.post("/token/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
 @pytest.mark.asyncio
 async def test_login_user_not_found(async_client):
     form_data = {
@@ -174,3 +207,36 @@ async def test_list_users_unauthorized(async_client, user_token):
     headers = {"Authorization": f"Bearer {user_token}"}
     response = await async_client.get("/users/", headers=headers)
     assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_list_users_follows_cursor(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    first = (await async_client.get("/users/?limit=10", headers=headers)).json()
+    assert first["next_cursor"]
+    response = await async_client.get("/users/", params={"cursor": first["next_cursor"], "limit": 10}, headers=headers)
+    assert response.status_code == 200
+    second = response.json()
+    assert second["page"] is None
+    assert {u["id"] for u in first["items"]}.isdisjoint(u["id"] for u in second["items"])
+    assert any(link["rel"] == "prev" for link in second["links"])
+
+@pytest.mark.asyncio
+async def test_list_users_invalid_cursor(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?cursor=garbage", headers=headers)
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_search_users(async_client, admin_token, admin_user, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/search", params={"role": "ADMIN"}, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["id"] == str(admin_user.id)
+
+@pytest.mark.asyncio
+async def test_search_users_unauthorized(async_client, user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    response = await async_client.get("/users/search", params={"q": "admin"}, headers=headers)
+    assert response.status_code == 403
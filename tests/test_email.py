@@ -1,5 +1,10 @@
 import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.models.user_model import User
 from app.services.email_service import EmailService
+from app.utils.smtp_connection import SMTPClient
 from app.utils.template_manager import TemplateManager
 
     
@@ -12,3 +17,79 @@ async def test_send_markdown_email(email_service):
     }
     await email_service.send_user_email(user_data, 'email_verification')
     # Manual verification in Mailtrap
+
+
+def bulk_email_service(sink, pool_size=2):
+    service = EmailService(template_manager=TemplateManager())
+    service.smtp_client = SMTPClient("127.0.0.1", sink.port, "sender@example.com", "secret",
+                                     pool_size=pool_size, use_tls=False, timeout=5)
+    return service
+
+
+def session_factory(db_session):
+    return sessionmaker(bind=db_session.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+def invitation_data(user):
+    return {"name": user.first_name, "email": user.email, "qr_code_url": f"http://example.com/qr/{user.id}"}
+
+
+async def test_send_bulk_reaches_every_user(db_session, smtp_sink, users_with_same_role_50_users):
+    service = bulk_email_service(smtp_sink)
+    snapshots = []
+    report = await service.send_bulk(
+        "invitation", recipient_data=invitation_data,
+        rate_per_second=0, progress=lambda r: snapshots.append(r.processed), progress_every=20,
+        batch_size=7, active_only=False, session_factory=session_factory(db_session),
+    )
+    service.smtp_client.close()
+    assert report.sent == 50 and report.failed == 0
+    assert len(smtp_sink.messages) == 50
+    assert smtp_sink.connections <= 2
+    assert snapshots[:2] == [20, 40] and snapshots[-1] == 50
+
+
+async def test_send_bulk_reports_failures(db_session, smtp_sink, users_with_same_role_50_users):
+    service = bulk_email_service(smtp_sink)
+    broken = users_with_same_role_50_users[0].email
+
+    def recipient_data(user):
+        data = invitation_data(user)
+        if user.email == broken:
+            del data["qr_code_url"]
+        return data
+
+    report = await service.send_bulk(
+        "invitation", criteria=[User.email.in_([broken, "user1@test.com"])], recipient_data=recipient_data,
+        rate_per_second=0, active_only=False, session_factory=session_factory(db_session),
+    )
+    service.smtp_client.close()
+    assert report.sent == 1
+    assert report.failures == [(broken, "'qr_code_url'")]
+
+
+async def test_send_bulk_is_rate_limited(db_session, smtp_sink, users_with_same_role_50_users):
+    service = bulk_email_service(smtp_sink, pool_size=1)
+    report = await service.send_bulk(
+        "invitation", recipient_data=invitation_data, rate_per_second=20, active_only=False, max_recipients=6,
+        session_factory=session_factory(db_session),
+    )
+    service.smtp_client.close()
+    assert report.sent == 6
+    assert report.elapsed >= 5 / 20
+
+
+async def test_send_bulk_skips_locked_and_unverified_users(db_session, smtp_sink, users_with_same_role_50_users):
+    service = bulk_email_service(smtp_sink)
+    locked, unverified = users_with_same_role_50_users[0].email, users_with_same_role_50_users[1].email
+    await db_session.execute(update(User).where(User.email.like("%@test.com")).values(email_verified=True))
+    await db_session.execute(update(User).where(User.email == locked).values(is_locked=True))
+    await db_session.execute(update(User).where(User.email == unverified).values(email_verified=False))
+    await db_session.commit()
+    report = await service.send_bulk(
+        "invitation", criteria=[User.email.like("%@test.com")], recipient_data=invitation_data,
+        rate_per_second=0, batch_size=10, session_factory=session_factory(db_session),
+    )
+    service.smtp_client.close()
+    assert report.sent == 48
+    assert len(smtp_sink.messages) == 48
@@ -0,0 +1,154 @@
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from app.services import jwt_service
+from app.services.jwt_service import TokenCache, create_access_token, decode_token
+
+
+@pytest.fixture
+def token_cache():
+    cache = jwt_service.configure_token_cache(100)
+    yield cache
+    jwt_service.configure_token_cache(jwt_service.settings.jwt_cache_size)
+
+
+def test_decode_token_caches_verified_tokens(token_cache):
+    token = create_access_token({"sub": "user-1", "role": "admin"})
+    first = decode_token(token)
+    second = decode_token(token)
+    assert first == second
+    assert first["role"] == "ADMIN"
+    assert token_cache.stats()["hits"] == 1
+    assert token_cache.stats()["size"] == 1
+
+
+def test_decode_token_never_caches_bad_signature(token_cache):
+    token = create_access_token({"sub": "user-1", "role": "ADMIN"})
+    header, payload, signature = token.split(".")
+    forged = f"{header}.{payload}.{signature[::-1]}"
+    assert decode_token(forged) is None
+    assert decode_token(forged) is None
+    assert token_cache.stats()["size"] == 0
+    assert token_cache.stats()["hits"] == 0
+
+
+def test_decode_token_rejects_expired_token(token_cache):
+    token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=-1))
+    assert decode_token(token) is None
+    assert token_cache.stats()["size"] == 0
+
+
+def test_token_cache_expires_entries_at_exp():
+    cache = TokenCache(10)
+    cache.put("token", {"sub": "user-1", "exp": time.time() - 1})
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_decode_token_without_cache():
+    cache = jwt_service.configure_token_cache(0)
+    try:
+        token = create_access_token({"sub": "user-1"})
+        assert decode_token(token)["sub"] == "user-1"
+        assert cache.max_size == 0
+        assert cache.stats()["size"] == 0
+    finally:
+        jwt_service.configure_token_cache(jwt_service.settings.jwt_cache_size)
+
+
+def test_token_cache_is_bounded():
+    cache = TokenCache(3)
+    exp = time.time() + 60
+    for i in range(10):
+        cache.put(f"token-{i}", {"sub": str(i), "exp": exp})
+    stats = cache.stats()
+    assert stats["size"] == 3
+    assert stats["evictions"] == 7
+    assert cache.get("token-0") is None
+    assert cache.get("token-9")["sub"] == "9"
+
+
+@pytest.fixture
+def rsa_keyring(tmp_path, monkeypatch, token_cache):
+    """Sign with RS256 from a temporary key directory holding an active and a retired key."""
+    serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    def write_key(kid, public_only=False):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        if public_only:
+            data = key.public_key().public_bytes(
+                serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            (tmp_path / f"{kid}.pub.pem").write_bytes(data)
+        else:
+            data = key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+            )
+            (tmp_path / f"{kid}.pem").write_bytes(data)
+        return key
+
+    write_key("current")
+    retired = write_key("retired", public_only=True)
+    monkeypatch.setattr(jwt_service.settings, "jwt_algorithm", "RS256")
+    monkeypatch.setattr(jwt_service.settings, "jwt_keys_dir", str(tmp_path))
+    monkeypatch.setattr(jwt_service.settings, "jwt_active_kid", "current")
+    keyring = jwt_service.reload_keyring("current")
+    yield keyring, retired
+    monkeypatch.undo()
+    jwt_service._keyring = None
+
+
+def test_asymmetric_token_has_kid_and_verifies(rsa_keyring):
+    token = create_access_token({"sub": "user-1", "role": "ADMIN"})
+    assert jwt.get_unverified_header(token) == {"alg": "RS256", "kid": "current", "typ": "JWT"}
+    assert decode_token(token)["sub"] == "user-1"
+
+
+def test_retired_key_still_verifies(rsa_keyring):
+    _, retired = rsa_keyring
+    token = jwt.encode(
+        {"sub": "user-1", "exp": int(time.time()) + 60}, retired, algorithm="RS256", headers={"kid": "retired"},
+    )
+    assert decode_token(token)["sub"] == "user-1"
+
+
+def test_unknown_kid_is_rejected(rsa_keyring):
+    forged = jwt.encode({"sub": "user-1", "exp": int(time.time()) + 60}, "secret", algorithm="HS256",
+                        headers={"kid": "missing"})
+    assert decode_token(forged) is None
+
+
+def test_jwks_lists_every_key(rsa_keyring):
+    keyring, _ = rsa_keyring
+    keys = {key["kid"]: key for key in keyring.jwks()["keys"]}
+    assert set(keys) == {"current", "retired"}
+    assert keys["current"]["kty"] == "RSA"
+    assert keys["current"]["alg"] == "RS256"
+    assert "d" not in keys["current"]
+
+
+def test_reload_keyring_rotates_signing_key(rsa_keyring, tmp_path):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    (tmp_path / "next.pem").write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    ))
+    old_token = create_access_token({"sub": "user-1"})
+    jwt_service.reload_keyring("next")
+    new_token = create_access_token({"sub": "user-1"})
+    assert jwt.get_unverified_header(new_token)["kid"] == "next"
+    assert decode_token(old_token)["sub"] == "user-1"
+
+
+def test_reload_keyring_keeps_old_ring_on_bad_kid(rsa_keyring):
+    keyring, _ = rsa_keyring
+    with pytest.raises(ValueError):
+        jwt_service.reload_keyring("missing")
+    assert jwt_service.get_keyring() is keyring
+    assert jwt.get_unverified_header(create_access_token({"sub": "user-1"}))["kid"] == "current"
@@ -49,3 +49,17 @@ def test_generate_pagination_links(mock_request):
     assert len(links) >= 4
     expected_self_url = "http://testserver/users?limit=5&skip=10"
     assert normalize_url(str(links[0].href)) == normalize_url(expected_self_url), "Self link should match expected URL"
+
+def test_generate_cursor_pagination_links(mock_request):
+    links = generate_pagination_links(mock_request, None, 5, 50, next_cursor="abc", prev_cursor="xyz")
+    hrefs = {link.rel: normalize_url(str(link.href)) for link in links}
+    assert hrefs["next"] == normalize_url("http://testserver/users?cursor=abc&limit=5")
+    assert hrefs["prev"] == normalize_url("http://testserver/users?cursor=xyz&limit=5")
+    assert "last" not in hrefs
+
+def test_cursor_pagination_links_keep_filters(mock_request):
+    mock_request.url = "http://testserver/users/search?q=alice&role=ADMIN&cursor=abc&limit=5"
+    links = generate_pagination_links(mock_request, None, 5, 50, next_cursor="def", prev_cursor="abc")
+    hrefs = {link.rel: normalize_url(str(link.href)) for link in links}
+    assert hrefs["first"] == normalize_url("http://testserver/users/search?q=alice&role=ADMIN&limit=5")
+    assert hrefs["next"] == normalize_url("http://testserver/users/search?q=alice&role=ADMIN&cursor=def&limit=5")
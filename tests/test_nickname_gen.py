@@ -0,0 +1,13 @@
+import re
+from app.utils.nickname_gen import ADJECTIVES, ANIMALS, NUMBER_SPACE, generate_nickname, generate_nicknames
+
+def test_generate_nickname_is_url_safe():
+    nickname = generate_nickname()
+    assert re.match(r'^[\w-]+$', nickname)
+    assert len(nickname) <= 50
+
+def test_nickname_space_is_large():
+    assert len(set(ADJECTIVES)) * len(set(ANIMALS)) * NUMBER_SPACE >= 10_000_000
+
+def test_generate_nicknames_are_distinct():
+    assert len(generate_nicknames(64)) == 64
@@ -0,0 +1,100 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event, inspect
+
+from app import dependencies
+from app.dependencies import get_current_user, require_role
+from app.models.user_model import UserRole
+from app.services.jwt_service import create_access_token
+from app.services.principal_cache import PrincipalCache, principal_cache
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+
+def credentials_for(user):
+    token = create_access_token({"sub": str(user.id), "role": user.role.name, "ver": user.token_version})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def test_cache_returns_transient_copy_without_secrets(user):
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    cache.put(user)
+    cached = cache.get(user.id)
+    assert cached is not user
+    assert inspect(cached).transient
+    assert cached.email == user.email
+    assert "hashed_password" not in inspect(cached).dict
+    assert cache.stats()["hits"] == 1
+
+
+async def test_disabled_cache_never_hits():
+    cache = PrincipalCache(ttl_seconds=0, max_size=10)
+    assert cache.enabled is False
+    assert cache.get("missing") is None
+
+
+async def test_get_current_user_skips_query_on_hit(db_session, admin_user):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    sync_engine = db_session.get_bind()
+    credentials = credentials_for(admin_user)
+    await get_current_user(credentials, db_session)
+    event.listen(sync_engine, "before_cursor_execute", listener)
+    try:
+        cached = await get_current_user(credentials, db_session)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", listener)
+    assert statements == []
+    assert cached.id == admin_user.id
+    assert cached.role == UserRole.ADMIN
+
+
+async def test_update_invalidates_principal(db_session, admin_user):
+    credentials = credentials_for(admin_user)
+    await get_current_user(credentials, db_session)
+    invalidations = principal_cache.stats()["invalidations"]
+    await UserService.update(db_session, admin_user.id, {"role": "AUTHENTICATED"})
+    assert principal_cache.stats()["invalidations"] == invalidations + 1
+    refreshed = await get_current_user(credentials, db_session)
+    assert refreshed.role == UserRole.AUTHENTICATED
+
+
+@pytest.fixture
+def claims_mode(monkeypatch):
+    monkeypatch.setattr(dependencies.app_settings, "auth_mode", "claims")
+
+
+async def test_claims_mode_authorizes_without_users_query(db_session, admin_user, claims_mode):
+    checker = require_role(["ADMIN"])
+    credentials = credentials_for(admin_user)
+    await checker(credentials, db_session)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    sync_engine = db_session.get_bind()
+    event.listen(sync_engine, "before_cursor_execute", listener)
+    try:
+        principal = await checker(credentials, db_session)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", listener)
+    assert statements == []
+    assert principal.id == admin_user.id
+    assert principal.role == UserRole.ADMIN
+
+
+async def test_claims_mode_revokes_token_after_demotion(db_session, admin_user, claims_mode):
+    checker = require_role(["ADMIN"])
+    credentials = credentials_for(admin_user)
+    await checker(credentials, db_session)
+    await UserService.update(db_session, admin_user.id, {"role": "AUTHENTICATED"})
+    with pytest.raises(HTTPException) as exc_info:
+        await checker(credentials, db_session)
+    assert exc_info.value.status_code == 401
+
+
+async def test_claims_mode_rejects_locked_user(db_session, locked_user, claims_mode):
+    checker = require_role(["AUTHENTICATED"])
+    with pytest.raises(HTTPException) as exc_info:
+        await checker(credentials_for(locked_user), db_session)
+    assert exc_info.value.status_code == 401
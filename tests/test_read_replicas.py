@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+
+from app.database import Database
+from app.dependencies import app_settings, get_client_key, get_settings
+from app.services.jwt_service import create_access_token
+from settings.config import Settings
+
+pytest.importorskip("aiosqlite")
+
+async def _create_marker_db(url: str, name: str):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE marker (name TEXT)"))
+        await conn.execute(text("INSERT INTO marker (name) VALUES (:name)"), {"name": name})
+    await engine.dispose()
+
+async def _marker(session_factory) -> str:
+    async with session_factory() as session:
+        result = await session.execute(text("SELECT name FROM marker"))
+        return result.scalar_one()
+
+@pytest.fixture
+async def replica_database(tmp_path):
+    """Point Database at two SQLite files standing in for a primary and a replica."""
+    primary_url = f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    await _create_marker_db(primary_url, "primary")
+    await _create_marker_db(replica_url, "replica")
+
+    await Database.dispose()
+    Database.initialize(primary_url, settings=Settings(read_your_writes_seconds=0.2), read_urls=[replica_url])
+    yield
+    await Database.dispose()
+    Database.initialize(get_settings().database_url)
+
+async def test_reads_go_to_replica(replica_database):
+    assert await _marker(Database.get_read_session_factory("client-a")) == "replica"
+    assert await _marker(Database.get_session_factory()) == "primary"
+
+async def test_reads_stay_on_primary_after_write(replica_database):
+    Database.mark_write("client-a")
+    assert await _marker(Database.get_read_session_factory("client-a")) == "primary"
+    assert await _marker(Database.get_read_session_factory("client-b")) == "replica"
+
+async def test_read_your_writes_window_expires(replica_database):
+    Database.mark_write("client-a")
+    await asyncio.sleep(0.3)
+    assert await _marker(Database.get_read_session_factory("client-a")) == "replica"
+
+async def test_reads_use_primary_without_replicas():
+    assert Database.get_read_session_factory("client-a") is Database.get_session_factory()
+
+def _request(host, **headers):
+    raw_headers = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw_headers, "client": (host, 1234)})
+
+def test_client_key_is_the_authenticated_user():
+    token = create_access_token({"sub": "user-1"})
+    assert get_client_key(_request("10.0.0.1", authorization=f"Bearer {token}")) == "user:user-1"
+    assert get_client_key(_request("10.0.0.2", authorization=f"Bearer {token}")) == "user:user-1"
+    assert get_client_key(_request("10.0.0.1", authorization="Bearer forged")) == "addr:10.0.0.1"
+
+def test_client_key_uses_forwarded_address_only_from_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(app_settings, "trusted_proxies", ["10.0.0.1"])
+    assert get_client_key(_request("10.0.0.1", x_forwarded_for="203.0.113.9, 10.0.0.1")) == "addr:203.0.113.9"
+    assert get_client_key(_request("198.51.100.7", x_forwarded_for="203.0.113.9")) == "addr:198.51.100.7"
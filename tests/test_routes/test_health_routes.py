@@ -0,0 +1,32 @@
+import pytest
+from httpx import AsyncClient
+
+from app.main import app
+
+@pytest.mark.asyncio
+async def test_liveness(async_client: AsyncClient):
+    response = await async_client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+@pytest.mark.asyncio
+async def test_readiness_after_database_probe(async_client: AsyncClient):
+    await app.state.health_monitor.run_once()
+    response = await async_client.get("/health/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["checks"]["database"]["status"] == "ok"
+
+@pytest.mark.asyncio
+async def test_not_ready_while_database_failing(async_client: AsyncClient, monkeypatch):
+    monitor = app.state.health_monitor
+
+    async def unreachable():
+        raise ConnectionError("database unreachable")
+
+    monkeypatch.setitem(monitor.probes, "database", unreachable)
+    await monitor.run_once()
+    response = await async_client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"]["error"] == "database unreachable"
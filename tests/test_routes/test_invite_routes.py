@@ -1,3 +1,4 @@
+import base64
 import pytest
 from httpx import AsyncClient
 from fastapi import status
@@ -61,3 +62,19 @@ async def test_invite_with_invalid_email(async_client: AsyncClient, user_token:
     )
 
     assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_reinvite_after_accept(async_client: AsyncClient, user_token: str):
+    email = "reinvite@example.com"
+    headers = {"Authorization": f"Bearer {user_token}"}
+    await async_client.post("/invite", json={"email": email}, headers=headers)
+    ref = base64.urlsafe_b64encode(email.encode()).decode()
+    accept = await async_client.get(f"/invite/accept?ref={ref}")
+    assert accept.status_code == 200
+
+    # The unique index only covers pending invites
+    response = await async_client.post("/invite", json={"email": email}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    counts = (await async_client.get("/me/invites", headers=headers)).json()
+    assert counts == {"sent": 2, "accepted": 1}
@@ -1,7 +1,13 @@
 # test_security.py
 from builtins import RuntimeError, ValueError, isinstance, str
+import asyncio
+import threading
 import pytest
-from app.utils.security import hash_password, verify_password
+from app.utils import security
+from app.utils.security import (
+    HashingPool, HashingPoolFull, hash_password, hash_password_async, password_needs_rehash, verify_password,
+    verify_password_async,
+)
 
 def test_hash_password():
     """Test that hashing password returns a bcrypt hashed string."""
@@ -65,3 +71,62 @@ def test_hash_password_internal_error(monkeypatch):
     with pytest.raises(ValueError):
         hash_password("test")
 
+
+
+async def test_hash_and_verify_password_async():
+    """Test that the pooled helpers hash and verify like the sync functions."""
+    hashed = await hash_password_async("secure_password", 4)
+    assert hashed.startswith('$2b$04$')
+    assert await verify_password_async("secure_password", hashed) is True
+    assert await verify_password_async("incorrect_password", hashed) is False
+
+async def test_hashing_pool_reports_queue_and_rejects_overflow():
+    """Test that the pool exposes its queue depth and rejects work beyond its limit."""
+    pool = HashingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        stats = pool.stats()
+        assert stats["running"] == 1
+        assert stats["queued"] == 1
+        with pytest.raises(HashingPoolFull):
+            await pool.run(release.wait)
+        assert pool.stats()["rejected"] == 1
+        release.set()
+        await asyncio.gather(running, queued)
+        assert pool.stats()["completed"] == 2
+        assert pool.stats()["queued"] == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.fixture
+def argon2_scheme(monkeypatch):
+    """Switch new hashes to cheap argon2id parameters."""
+    monkeypatch.setattr(security.settings, "password_hash_scheme", "argon2")
+    monkeypatch.setattr(security.settings, "argon2_time_cost", 1)
+    monkeypatch.setattr(security.settings, "argon2_memory_cost", 8192)
+    monkeypatch.setattr(security.settings, "argon2_parallelism", 1)
+
+def test_hash_password_argon2id(argon2_scheme):
+    """Test that the argon2 scheme produces argon2id hashes that verify."""
+    hashed = hash_password("secure_password")
+    assert hashed.startswith('$argon2id$')
+    assert verify_password("secure_password", hashed) is True
+    assert verify_password("incorrect_password", hashed) is False
+    assert password_needs_rehash(hashed) is False
+
+def test_legacy_bcrypt_hash_needs_rehash(argon2_scheme):
+    """Test that bcrypt hashes still verify but are flagged for rehash under argon2."""
+    legacy = hash_password("secure_password", 4)
+    assert verify_password("secure_password", legacy) is True
+    assert password_needs_rehash(legacy) is True
+
+def test_changed_costs_need_rehash(monkeypatch):
+    """Test that a hash made with other costs than configured is flagged for rehash."""
+    monkeypatch.setattr(security.settings, "bcrypt_rounds", 4)
+    assert password_needs_rehash(hash_password("secure_password")) is False
+    assert password_needs_rehash(hash_password("secure_password", 5)) is True
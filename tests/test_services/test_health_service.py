@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.services.health_service import HealthMonitor
+
+pytestmark = pytest.mark.asyncio
+
+
+async def ok():
+    pass
+
+
+async def failing():
+    raise ConnectionError("down")
+
+
+async def hanging():
+    await asyncio.sleep(10)
+
+
+# Test that readiness waits for the first probe run
+async def test_not_ready_before_first_probe():
+    monitor = HealthMonitor({"database": ok})
+    assert not monitor.is_ready()
+    assert monitor.report()["checks"]["database"]["status"] == "unknown"
+    await monitor.run_once()
+    assert monitor.is_ready()
+
+# Test that only required probes gate readiness
+async def test_optional_probe_failure_is_reported_only():
+    monitor = HealthMonitor({"database": ok, "smtp": failing}, required=["database"])
+    await monitor.run_once()
+    assert monitor.is_ready()
+    smtp = monitor.report()["checks"]["smtp"]
+    assert smtp["status"] == "failing" and smtp["error"] == "down"
+    await monitor.run_once()
+    assert monitor.results["smtp"].consecutive_failures == 2
+
+# Test that a hung dependency fails its probe at the timeout
+async def test_probe_timeout():
+    monitor = HealthMonitor({"database": hanging}, timeout=0.05)
+    await monitor.run_once()
+    assert not monitor.is_ready()
+    assert monitor.results["database"].status == "failing"
+
+# Test that the background loop probes without blocking the caller and stops cleanly
+async def test_background_loop():
+    monitor = HealthMonitor({"database": ok, "smtp": hanging}, interval=0.01, timeout=5)
+    monitor.start()
+    for _ in range(100):
+        if monitor.is_ready():
+            break
+        await asyncio.sleep(0.01)
+    assert monitor.is_ready()
+    await monitor.stop()
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.models.outbox_model import OutboxMessage
+from app.services.outbox_service import EMAIL, OutboxRelay, enqueue_email
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_relay(db_session, handler, **kwargs):
+    factory = sessionmaker(bind=db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    return OutboxRelay(handlers={EMAIL: handler}, session_factory=factory, **kwargs)
+
+
+async def queue_one(db_session):
+    enqueue_email(db_session, {
+        "name": "Test", "email": "outbox@example.com", "verification_url": "http://localhost/verify-email/1/secret-token",
+    }, "email_verification")
+    await db_session.commit()
+
+
+async def fetch_messages(db_session):
+    db_session.expire_all()
+    return (await db_session.execute(select(OutboxMessage))).scalars().all()
+
+
+# Test that registering a user queues the verification email in the same transaction
+async def test_register_user_writes_outbox_message(db_session, email_service):
+    user = await UserService.register_user(db_session, {
+        "nickname": "outbox_user",
+        "email": "outbox_user@example.com",
+        "password": "ValidPassword123!",
+        "role": "AUTHENTICATED",
+    }, email_service)
+    assert user is not None
+    user_id = str(user.id)  # read before fetch_messages() expires the instance
+    messages = await fetch_messages(db_session)
+    assert len(messages) == 1
+    assert messages[0].kind == EMAIL
+    assert messages[0].status == "pending"
+    assert messages[0].payload["user_data"]["email"] == "outbox_user@example.com"
+    assert user_id in messages[0].payload["user_data"]["verification_url"]
+
+# Test that the relay delivers pending messages and marks them sent
+async def test_relay_marks_message_sent(db_session):
+    delivered = []
+
+    async def handler(payload):
+        delivered.append(payload)
+
+    await queue_one(db_session)
+    relay = make_relay(db_session, handler)
+    assert await relay.run_once() == 1
+    assert delivered[0]["email_type"] == "email_verification"
+    [message] = await fetch_messages(db_session)
+    assert message.status == "sent" and message.sent_at is not None
+    assert await relay.run_once() == 0
+
+# Test that a delivered message no longer stores the verification link
+async def test_sent_payload_is_redacted(db_session):
+    async def handler(payload):
+        pass
+
+    await queue_one(db_session)
+    await make_relay(db_session, handler).run_once()
+    [message] = await fetch_messages(db_session)
+    assert message.payload == {"email_type": "email_verification", "user_data": {"email": "outbox@example.com"}}
+
+# Test that messages are claimed and committed before delivery starts
+async def test_claim_commits_before_delivery(db_session):
+    seen = []
+    relay = None
+
+    async def handler(payload):
+        async with relay.session_factory() as session:
+            seen.append((await session.execute(select(OutboxMessage.status))).scalar_one())
+        # A second relay finds nothing to claim while this one delivers
+        seen.append(len(await relay.claim()))
+
+    await queue_one(db_session)
+    relay = make_relay(db_session, handler)
+    assert await relay.run_once() == 1
+    assert seen == ["sending", 0]
+
+# Test that a message left in "sending" by a crashed relay is retried once its lease expires
+async def test_expired_claim_is_reclaimed(db_session):
+    async def handler(payload):
+        pass
+
+    await queue_one(db_session)
+    relay = make_relay(db_session, handler, claim_timeout=60)
+    assert len(await relay.claim()) == 1
+    assert await relay.run_once() == 0
+    await db_session.execute(update(OutboxMessage).values(available_at=datetime.now(timezone.utc)))
+    await db_session.commit()
+    assert await relay.run_once() == 1
+    [message] = await fetch_messages(db_session)
+    assert message.status == "sent"
+
+# Test that a message whose deliveries keep crashing the relay is dead-lettered
+async def test_repeatedly_expired_claim_is_dead_lettered(db_session):
+    delivered = []
+
+    async def handler(payload):
+        delivered.append(payload)
+
+    await queue_one(db_session)
+    relay = make_relay(db_session, handler, max_attempts=2, claim_timeout=60)
+    for _ in range(2):
+        # The relay claims the message and dies before recording an outcome
+        assert len(await relay.claim()) == 1
+        await db_session.execute(update(OutboxMessage).values(available_at=datetime.now(timezone.utc)))
+        await db_session.commit()
+    assert await relay.run_once() == 0
+    [message] = await fetch_messages(db_session)
+    assert message.status == "dead"
+    assert message.attempts == 2
+    assert delivered == []
+    assert relay.stats()["dead"] == 1
+
+# Test that a failed delivery is rescheduled with backoff
+async def test_relay_reschedules_failure(db_session):
+    async def handler(payload):
+        raise ConnectionError("smtp down")
+
+    await queue_one(db_session)
+    relay = make_relay(db_session, handler, backoff_base=60)
+    assert await relay.run_once() == 1
+    [message] = await fetch_messages(db_session)
+    assert message.status == "pending"
+    assert message.attempts == 1
+    assert message.last_error == "smtp down"
+    assert (message.available_at - datetime.now(timezone.utc)).total_seconds() > 30
+    # Not due yet, so the next pass skips it
+    assert await relay.run_once() == 0
+
+# Test that a message is dead-lettered after max_attempts failures
+async def test_relay_dead_letters_after_max_attempts(db_session):
+    async def handler(payload):
+        raise ConnectionError("smtp down")
+
+    await queue_one(db_session)
+    relay = make_relay(db_session, handler, max_attempts=2)
+    for _ in range(2):
+        await relay.run_once()
+        await db_session.execute(update(OutboxMessage).values(available_at=datetime.now(timezone.utc)))
+        await db_session.commit()
+    [message] = await fetch_messages(db_session)
+    assert message.status == "dead"
+    assert message.attempts == 2
+    assert relay.stats() == {"sent": 0, "retried": 1, "dead": 1, "pruned": 0}
+
+# Test that old sent and dead messages are pruned
+async def test_prune_removes_old_messages(db_session):
+    async def handler(payload):
+        pass
+
+    for _ in range(3):
+        await queue_one(db_session)
+    relay = make_relay(db_session, handler, sent_retention=timedelta(days=1), dead_retention=timedelta(days=1))
+    await relay.run_once()
+    old = datetime.now(timezone.utc) - timedelta(days=2)
+    [first, second, third] = await fetch_messages(db_session)
+    first.sent_at = old
+    second.status, second.created_at = "dead", old
+    kept = third.id
+    await db_session.commit()
+    assert await relay.prune() == 2
+    assert [message.id for message in await fetch_messages(db_session)] == [kept]
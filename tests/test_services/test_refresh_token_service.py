@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app.models.refresh_token_model import RefreshToken
+from app.services.refresh_token_service import RefreshTokenService
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+# Test that only the hash of an issued token is stored
+async def test_issue_stores_hash_only(db_session, verified_user):
+    token = await RefreshTokenService.issue(db_session, verified_user)
+    stored = (await db_session.execute(select(RefreshToken.token_hash))).scalars().all()
+    assert stored == [RefreshTokenService.hash_token(token)]
+    assert token not in stored
+
+# Test that a refresh rotates the token within the same family
+async def test_rotate_issues_next_token(db_session, verified_user):
+    token = await RefreshTokenService.issue(db_session, verified_user)
+    user, next_token = await RefreshTokenService.rotate(db_session, token)
+    assert user.id == verified_user.id
+    assert next_token and next_token != token
+    families = (await db_session.execute(select(RefreshToken.family_id))).scalars().all()
+    assert len(families) == 2 and len(set(families)) == 1
+
+# Test that presenting a consumed token revokes the whole family
+async def test_reused_token_revokes_family(db_session, verified_user):
+    token = await RefreshTokenService.issue(db_session, verified_user)
+    _, next_token = await RefreshTokenService.rotate(db_session, token)
+    assert await RefreshTokenService.rotate(db_session, token) == (None, None)
+    assert await RefreshTokenService.rotate(db_session, next_token) == (None, None)
+    revoked = (await db_session.execute(select(RefreshToken.revoked_at))).scalars().all()
+    assert all(revoked)
+
+# Test that an unknown token is rejected
+async def test_rotate_unknown_token(db_session):
+    assert await RefreshTokenService.rotate(db_session, "not-a-token") == (None, None)
+
+# Test that a role change invalidates outstanding refresh tokens
+async def test_role_change_invalidates_refresh_token(db_session, verified_user):
+    token = await RefreshTokenService.issue(db_session, verified_user)
+    await UserService.update(db_session, verified_user.id, {"role": "MANAGER"})
+    assert await RefreshTokenService.rotate(db_session, token) == (None, None)
+
+# Test that a login and its refresh token are committed together
+async def test_login_commits_once_with_refresh_token(db_session, verified_user):
+    commits = []
+    listener = lambda session: commits.append(session)
+    event.listen(db_session.sync_session, "after_commit", listener)
+    try:
+        user, locked, token = await UserService.login(db_session, verified_user.email, "MySuperPassword$1234")
+    finally:
+        event.remove(db_session.sync_session, "after_commit", listener)
+    assert user is not None and not locked
+    assert len(commits) == 1
+    stored = (await db_session.execute(select(RefreshToken.token_hash))).scalars().all()
+    assert stored == [RefreshTokenService.hash_token(token)]
+
+# Test that only expired tokens are purged
+async def test_purge_expired_tokens(db_session, verified_user):
+    expired = await RefreshTokenService.issue(db_session, verified_user)
+    live = await RefreshTokenService.issue(db_session, verified_user)
+    await db_session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == RefreshTokenService.hash_token(expired))
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+    )
+    await db_session.commit()
+    assert await RefreshTokenService.purge_expired(db_session) == 1
+    stored = (await db_session.execute(select(RefreshToken.token_hash))).scalars().all()
+    assert stored == [RefreshTokenService.hash_token(live)]
@@ -1,11 +1,13 @@
 from builtins import range
 from pydantic import ValidationError
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
+from sqlalchemy.exc import OperationalError
 from app.dependencies import get_settings
 from app.models.user_model import User, UserRole
-from app.schemas.user_schemas import UserCreate
-from app.services.user_service import UserService
+from app.schemas.user_schemas import UserCreate, UserUpdate
+from app.services.user_service import UserConflict, UserService
+from app.utils import security
 from app.utils.nickname_gen import generate_nickname
 
 pytestmark = pytest.mark.asyncio
@@ -72,8 +74,36 @@ async def test_update_user_valid_data(db_session, user):
 
 # Test updating a user with invalid data
 async def test_update_user_invalid_data(db_session, user):
-    updated_user = await UserService.update(db_session, user.id, {"email": "invalidemail"})
-    assert updated_user is None
+    with pytest.raises(ValidationError):
+        await UserService.update(db_session, user.id, {"email": "invalidemail"})
+
+# Test that updating to another user's email raises UserConflict
+async def test_update_user_duplicate_email(db_session, user, verified_user):
+    with pytest.raises(UserConflict):
+        await UserService.update(db_session, user.id, {"email": verified_user.email})
+
+# Test that database errors other than a unique conflict are not reported as a missing user
+async def test_update_user_propagates_database_errors(db_session, user, monkeypatch):
+    async def fail(*args, **kwargs):
+        raise OperationalError("UPDATE users", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(db_session, "execute", fail)
+    with pytest.raises(OperationalError):
+        await UserService.update(db_session, user.id, {"first_name": "Lost"})
+
+# Test that an update is a single UPDATE ... RETURNING and accepts a validated schema
+async def test_update_user_single_statement(db_session, user):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    sync_engine = db_session.get_bind()
+    event.listen(sync_engine, "before_cursor_execute", listener)
+    try:
+        updated_user = await UserService.update(db_session, user.id, UserUpdate(first_name="Returned"))
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", listener)
+    assert updated_user.first_name == "Returned"
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("UPDATE")
 
 # Test deleting a user who exists
 async def test_delete_user_exists(db_session, user):
@@ -143,6 +173,35 @@ async def test_account_lock_after_failed_logins(db_session, verified_user):
     is_locked = await UserService.is_account_locked(db_session, verified_user.email)
     assert is_locked, "The account should be locked after the maximum number of failed login attempts."
 
+# Test that authenticate reports a locked account without touching it
+async def test_authenticate_locked_user(db_session, locked_user):
+    user, locked = await UserService.authenticate(db_session, locked_user.email, "MySuperPassword$1234")
+    assert user is None
+    assert locked is True
+
+# Test that a failed attempt is counted in SQL and a success resets the counter
+async def test_authenticate_counts_failures_and_resets(db_session, verified_user):
+    user, locked = await UserService.authenticate(db_session, verified_user.email, "wrongpassword")
+    assert (user, locked) == (None, False)
+    assert verified_user.failed_login_attempts == 1
+    user, locked = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert user is verified_user
+    assert user.failed_login_attempts == 0
+    assert user.last_login_at is not None
+
+# Test that a successful login upgrades a legacy bcrypt hash to argon2id
+async def test_authenticate_rehashes_legacy_password(db_session, verified_user, monkeypatch):
+    monkeypatch.setattr(security.settings, "password_hash_scheme", "argon2")
+    monkeypatch.setattr(security.settings, "argon2_time_cost", 1)
+    monkeypatch.setattr(security.settings, "argon2_memory_cost", 8192)
+    monkeypatch.setattr(security.settings, "argon2_parallelism", 1)
+    user, _ = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert user is not None
+    stored = await db_session.scalar(select(User.hashed_password).where(User.id == verified_user.id))
+    assert stored.startswith("$argon2id$")
+    user, _ = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert user is not None
+
 # Test resetting a user's password
 async def test_reset_password(db_session, user):
     new_password = "NewPassword123!"
@@ -163,3 +222,144 @@ async def test_unlock_user_account(db_session, locked_user):
     assert unlocked, "The account should be unlocked"
     refreshed_user = await UserService.get_by_id(db_session, locked_user.id)
     assert not refreshed_user.is_locked, "The user should no longer be locked"
+
+# Test that plain reads never commit and a write commits exactly once
+async def test_reads_do_not_commit(db_session, user):
+    commits = []
+    listener = lambda session: commits.append(session)
+    event.listen(db_session.sync_session, "after_commit", listener)
+    try:
+        await UserService.get_by_id(db_session, user.id)
+        await UserService.get_by_email(db_session, user.email)
+        await UserService.list_users(db_session, skip=0, limit=10)
+        assert commits == []
+        await UserService.update(db_session, user.id, {"first_name": "Committed"})
+        assert len(commits) == 1
+    finally:
+        event.remove(db_session.sync_session, "after_commit", listener)
+
+# Test keyset pagination walks forward and back consistently with offset pages
+async def test_list_users_with_cursor(db_session, users_with_same_role_50_users):
+    page_1, next_cursor, prev_cursor = await UserService.list_users_keyset(db_session, limit=10)
+    assert prev_cursor is None
+    assert next_cursor is not None
+
+    page_2, _, prev_cursor = await UserService.list_users_keyset(db_session, limit=10, cursor=next_cursor)
+    offset_page_2 = await UserService.list_users(db_session, skip=10, limit=10)
+    assert [u.id for u in page_2] == [u.id for u in offset_page_2]
+
+    back, _, _ = await UserService.list_users_keyset(db_session, limit=10, cursor=prev_cursor)
+    assert [u.id for u in back] == [u.id for u in page_1]
+
+# Test a malformed cursor is rejected
+async def test_list_users_with_invalid_cursor(db_session):
+    with pytest.raises(ValueError):
+        await UserService.list_users_keyset(db_session, limit=10, cursor="not-a-cursor")
+
+# Test cached totals are served from cache and dropped when a user is created
+async def test_count_rows_cached_invalidated_on_create(db_session, user, email_service):
+    UserService.invalidate_count_cache()
+    assert await UserService.count_rows(db_session, User, strategy="cached") == (1, False)
+    assert await UserService.count_rows(db_session, User, strategy="cached") == (1, True)
+    user_data = {
+        "email": "count_cache@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.AUTHENTICATED.name
+    }
+    await UserService.create(db_session, user_data, email_service)
+    assert await UserService.count_rows(db_session, User, strategy="cached") == (2, False)
+
+# Test cached filtered totals cannot grow the cache without bound
+async def test_count_cache_is_bounded(db_session, user, monkeypatch):
+    from app.services import user_service
+    monkeypatch.setattr(user_service.settings, "count_cache_size", 3)
+    UserService.invalidate_count_cache()
+    for i in range(10):
+        await UserService.count_rows(db_session, User, User.nickname == f"search_{i}", strategy="cached")
+    assert UserService._count_cache[User.__tablename__].stats()["size"] == 3
+    UserService.invalidate_count_cache()
+
+# Test estimated totals fall back to a real count on small tables
+async def test_count_rows_estimated_small_table(db_session, user):
+    UserService.invalidate_count_cache()
+    total, _ = await UserService.count_rows(db_session, User, strategy="estimated")
+    assert total == 1
+
+# Test filtered counts
+async def test_count_rows_with_criteria(db_session, user, admin_user):
+    total, approximate = await UserService.count_rows(db_session, User, User.role == UserRole.ADMIN)
+    assert (total, approximate) == (1, False)
+
+# Test projected list loads only the response columns and never the secrets
+async def test_list_users_projection_skips_unused_columns(db_session, users_with_same_role_50_users):
+    db_session.expunge_all()
+    users = await UserService.list_users(db_session, skip=0, limit=10, projection=True)
+    unloaded = inspect(users[0]).unloaded
+    assert {"hashed_password", "verification_token", "is_locked", "failed_login_attempts"} <= unloaded
+    assert "bio" not in unloaded
+
+# Test search by fragment and filters
+async def test_search_users(db_session, users_with_same_role_50_users, admin_user, locked_user):
+    users, _, _ = await UserService.search(db_session, limit=100, q="user1")
+    assert users and all("user1" in u.email for u in users)
+
+    admins, _, _ = await UserService.search(db_session, limit=100, role=UserRole.ADMIN)
+    assert [u.id for u in admins] == [admin_user.id]
+
+    locked, _, _ = await UserService.search(db_session, limit=100, is_locked=True)
+    assert [u.id for u in locked] == [locked_user.id]
+
+# Test LIKE wildcards in the fragment are matched literally
+async def test_search_users_escapes_wildcards(db_session, users_with_same_role_50_users):
+    users, _, _ = await UserService.search(db_session, limit=100, q="%")
+    assert users == []
+
+# Test creating a user with an existing email returns None without raising
+async def test_create_user_duplicate_email(db_session, email_service, user):
+    user_data = {
+        "email": user.email,
+        "password": "ValidPassword123!",
+        "role": UserRole.AUTHENTICATED.name
+    }
+    assert await UserService.create(db_session, user_data, email_service) is None
+
+# Test that a database error during creation is raised, not reported as a duplicate email
+async def test_create_user_propagates_database_errors(db_session, email_service, monkeypatch):
+    async def fail(*args, **kwargs):
+        raise OperationalError("INSERT INTO users", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(db_session, "execute", fail)
+    user_data = {
+        "email": "db_error@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.AUTHENTICATED.name
+    }
+    with pytest.raises(OperationalError):
+        await UserService.create(db_session, user_data, email_service)
+
+# Test the created user carries its verification token for the verification email
+async def test_create_user_returns_verification_token(db_session, email_service):
+    user_data = {
+        "email": "token_user@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.AUTHENTICATED.name
+    }
+    user = await UserService.create(db_session, user_data, email_service)
+    assert user.verification_token
+    assert user.email_verified is False
+
+# Test nickname allocation skips taken candidates
+async def test_allocate_nickname_skips_taken(db_session, user, monkeypatch):
+    taken = {user.nickname}
+    monkeypatch.setattr(
+        "app.services.user_service.generate_nicknames",
+        lambda count: set(taken) | {"free_nickname_1"}
+    )
+    assert await UserService.allocate_nickname(db_session) == "free_nickname_1"
+
+# Test nickname allocation falls back to a random suffix when every candidate is taken
+async def test_allocate_nickname_fallback(db_session, user, monkeypatch):
+    monkeypatch.setattr("app.services.user_service.generate_nicknames", lambda count: {user.nickname})
+    nickname = await UserService.allocate_nickname(db_session)
+    assert nickname != user.nickname
+    assert await UserService.get_by_nickname(db_session, nickname) is None
@@ -0,0 +1,88 @@
+import asyncio
+import smtplib
+import socket
+import time
+
+import pytest
+
+from app.utils import smtp_connection
+from app.utils.smtp_connection import SMTPClient, SMTPPoolClosed
+
+
+def make_client(sink, **kwargs):
+    return SMTPClient("127.0.0.1", sink.port, "sender@example.com", "secret", use_tls=False, timeout=5, **kwargs)
+
+
+def test_connection_is_reused_across_messages(smtp_sink):
+    client = make_client(smtp_sink, pool_size=2)
+    for i in range(5):
+        client.send_email(f"Subject {i}", f"<p>Body {i}</p>", "to@example.com")
+    client.close()
+    assert len(smtp_sink.messages) == 5
+    assert smtp_sink.connections == 1
+    assert smtp_sink.logins == 1
+    assert "Subject: Subject 4" in smtp_sink.messages[-1]
+
+
+async def test_send_email_async_runs_concurrently(smtp_sink):
+    client = make_client(smtp_sink, pool_size=3)
+    await asyncio.gather(*(
+        client.send_email_async("Hello", "<p>Hi</p>", f"user{i}@example.com") for i in range(9)
+    ))
+    client.close()
+    assert len(smtp_sink.messages) == 9
+    assert smtp_sink.connections <= 3
+
+
+def test_idle_connections_are_reaped(smtp_sink):
+    client = make_client(smtp_sink, idle_timeout=0.05)
+    client.send_email("First", "<p>1</p>", "to@example.com")
+    time.sleep(0.1)
+    client.pool.reap_idle()
+    assert client.pool.stats()["reaped"] == 1
+    assert client.pool.stats()["open"] == 0
+    client.send_email("Second", "<p>2</p>", "to@example.com")
+    client.close()
+    assert smtp_sink.connections == 2
+
+
+def test_broken_connection_is_replaced(smtp_sink):
+    client = make_client(smtp_sink)
+    client.send_email("First", "<p>1</p>", "to@example.com")
+    # Simulate the server dropping the pooled connection.
+    client.pool._idle[0][0].sock.shutdown(socket.SHUT_RDWR)
+    client.send_email("Second", "<p>2</p>", "to@example.com")
+    client.close()
+    assert len(smtp_sink.messages) == 2
+    assert client.pool.stats()["discarded"] == 1
+    assert smtp_sink.connections == 2
+
+
+def test_send_is_not_retried_after_data(smtp_sink):
+    client = make_client(smtp_sink)
+    smtp_sink.drop_after_data = True
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        client.send_email("Once", "<p>1</p>", "to@example.com")
+    client.close()
+    assert len(smtp_sink.messages) == 1
+    assert client.pool.stats()["discarded"] == 1
+
+
+async def test_closed_client_refuses_sends(smtp_sink):
+    client = make_client(smtp_sink)
+    client.send_email("First", "<p>1</p>", "to@example.com")
+    client.close()
+    assert client.pool.stats()["open"] == 0
+    with pytest.raises(SMTPPoolClosed):
+        client.send_email("Second", "<p>2</p>", "to@example.com")
+    with pytest.raises(RuntimeError):
+        await client.send_email_async("Third", "<p>3</p>", "to@example.com")
+    assert len(smtp_sink.messages) == 1
+
+
+def test_shared_client_is_recreated_after_close():
+    first = smtp_connection.get_smtp_client()
+    smtp_connection.close_smtp_client()
+    second = smtp_connection.get_smtp_client()
+    assert second is not first
+    smtp_connection.close_smtp_client()
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from app.utils.template_manager import TemplateManager, get_template_manager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    (tmp_path / "header.md").write_text("# Header\n", encoding="utf-8")
+    (tmp_path / "footer.md").write_text("Footer\n", encoding="utf-8")
+    (tmp_path / "greeting.md").write_text("Hello {name},\n\n[Verify]({url})\n", encoding="utf-8")
+    manager = TemplateManager()
+    manager.templates_dir = tmp_path
+    return manager
+
+
+def test_render_substitutes_and_styles(manager):
+    html = manager.render_template("greeting", name="Ada", url="http://example.com/v?a=1&b=2")
+    assert "Hello Ada," in html
+    assert 'href="http://example.com/v?a=1&amp;b=2"' in html
+    assert '<h1 style="' in html
+    assert "{name}" not in html
+
+
+def test_render_escapes_values(manager):
+    html = manager.render_template("greeting", name="<script>", url="#")
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_template_compiled_once(manager):
+    for name in ("Ada", "Grace", "Linus"):
+        assert f"Hello {name}," in manager.render_template("greeting", name=name, url="#")
+    assert manager.compiles == 1
+
+
+def test_template_recompiled_when_file_changes(manager, tmp_path):
+    manager.render_template("greeting", name="Ada", url="#")
+    path = tmp_path / "greeting.md"
+    path.write_text("Hi {name}!\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+    assert "Hi Ada!" in manager.render_template("greeting", name="Ada", url="#")
+    assert manager.compiles == 2
+
+
+def test_missing_value_raises(manager):
+    with pytest.raises(KeyError):
+        manager.render_template("greeting", name="Ada")
+
+
+def test_template_manager_is_shared():
+    assert get_template_manager() is get_template_manager()
@@ -0,0 +1,54 @@
+from app.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(10, ttl_seconds=5, clock=clock)
+    cache.put("key", "value")
+    assert cache.get("key") == "value"
+    clock.now += 5
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_explicit_expiry_overrides_ttl():
+    clock = FakeClock()
+    cache = TTLCache(10, clock=clock)
+    cache.put("key", "value")  # no TTL and no expiry: not cached
+    assert cache.get("key") is None
+    cache.put("key", "value", expires_at=clock.now + 1)
+    assert cache.get("key") == "value"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_size_disables_cache():
+    cache = TTLCache(0, ttl_seconds=60)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_invalidate_counts():
+    cache = TTLCache(10, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1